@@ -0,0 +1,307 @@
+/*
+ * Optional accelerator for the core lookup functions of **roam**, with the
+ * same semantics as ``roam._py_lookup_attr()`` and ``roam._py_lookup_item()``.
+ *
+ * Build it in place with ``python setup_speedups.py build_ext --inplace``.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+static PyObject *MISSING = NULL;    /* roam.MISSING marker */
+static PyObject *FIELD_MAP = NULL;  /* roam._field_map() function */
+
+/* Return whether the current exception is a TypeError or AttributeError */
+static int
+attr_error_occurred(void)
+{
+    return PyErr_ExceptionMatches(PyExc_TypeError) ||
+           PyErr_ExceptionMatches(PyExc_AttributeError);
+}
+
+/* Return whether the current exception is a TypeError or LookupError */
+static int
+item_error_occurred(void)
+{
+    return PyErr_ExceptionMatches(PyExc_TypeError) ||
+           PyErr_ExceptionMatches(PyExc_LookupError);
+}
+
+/* Return a new reference to getattr(item, name), or MISSING if it fails */
+static PyObject *
+try_getattr(PyObject *item, PyObject *name)
+{
+    PyObject *result = PyObject_GetAttr(item, name);
+    if (result == NULL && attr_error_occurred()) {
+        PyErr_Clear();
+        Py_INCREF(MISSING);
+        return MISSING;
+    }
+    return result;
+}
+
+/* Return a new reference to item[key], or MISSING if it fails */
+static PyObject *
+try_getitem(PyObject *item, PyObject *key)
+{
+    PyObject *result = PyObject_GetItem(item, key);
+    if (result == NULL && item_error_occurred()) {
+        PyErr_Clear();
+        Py_INCREF(MISSING);
+        return MISSING;
+    }
+    return result;
+}
+
+/* Return a new reference to the field map of the item's class, or to None.
+ * Built-in containers never have fields so skip calling ``_field_map()`` */
+static PyObject *
+field_map(PyObject *item)
+{
+    if (PyDict_CheckExact(item) || PyList_CheckExact(item) ||
+        PyTuple_CheckExact(item) || PyUnicode_CheckExact(item) ||
+        PyLong_CheckExact(item)) {
+        Py_RETURN_NONE;
+    }
+    return PyObject_CallFunctionObjArgs(FIELD_MAP, (PyObject *)Py_TYPE(item), NULL);
+}
+
+/* Return a new reference to the field ``name`` of ``item`` if its class has
+ * fields and ``name`` is one, to MISSING if such a field is not set, or to
+ * NULL without an exception set if ``name`` is not a field */
+static PyObject *
+lookup_field(PyObject *item, PyObject *name, int *is_field)
+{
+    PyObject *fields, *index, *result;
+
+    *is_field = 0;
+    fields = field_map(item);
+    if (fields == NULL) {
+        return NULL;
+    }
+    if (fields == Py_None) {
+        Py_DECREF(fields);
+        return NULL;
+    }
+    index = PyDict_GetItemWithError(fields, name);  /* Borrowed */
+    if (index == NULL) {
+        Py_DECREF(fields);
+        return NULL;
+    }
+    *is_field = 1;
+    if (index == Py_None) {
+        result = try_getattr(item, name);
+    }
+    else {
+        result = PyObject_GetItem(item, index);
+    }
+    Py_DECREF(fields);
+    return result;
+}
+
+/* Add a lookup result to a list of multiple items, flattening collections
+ * and omitting None and MISSING results. Steals the result reference */
+static int
+append_flattened(PyObject *multi_items, PyObject *lookup)
+{
+    int status = 0;
+
+    if (PyTuple_Check(lookup) || PyList_Check(lookup) || PyRange_Check(lookup)) {
+        PyObject *extended = PySequence_InPlaceConcat(multi_items, lookup);
+        if (extended == NULL) {
+            status = -1;
+        }
+        Py_XDECREF(extended);
+    }
+    else if (lookup != Py_None && lookup != MISSING) {
+        status = PyList_Append(multi_items, lookup);
+    }
+    Py_DECREF(lookup);
+    return status;
+}
+
+/* Return a new reference to a tuple of the items in a list, and release it */
+static PyObject *
+as_tuple(PyObject *multi_items)
+{
+    PyObject *result = PyList_AsTuple(multi_items);
+    Py_DECREF(multi_items);
+    return result;
+}
+
+/* Return a new reference to ``item.name`` falling back to ``item[name]`` */
+static PyObject *
+single_attr(PyObject *item, PyObject *name)
+{
+    PyObject *result = PyObject_GetAttr(item, name);
+    if (result != NULL || !attr_error_occurred()) {
+        return result;
+    }
+    PyErr_Clear();
+    return try_getitem(item, name);
+}
+
+/* Return a new reference to ``item[key]`` falling back to ``item.key`` for
+ * non-integer keys, looking up fields directly */
+static PyObject *
+single_item(PyObject *item, PyObject *key)
+{
+    PyObject *result;
+
+    if (PyUnicode_Check(key)) {
+        int is_field;
+        result = lookup_field(item, key, &is_field);
+        if (result != NULL || is_field || PyErr_Occurred()) {
+            return result;
+        }
+    }
+    result = PyObject_GetItem(item, key);
+    if (result != NULL || !item_error_occurred()) {
+        return result;
+    }
+    PyErr_Clear();
+    if (PyLong_Check(key)) {
+        Py_INCREF(MISSING);
+        return MISSING;
+    }
+    return try_getattr(item, key);
+}
+
+static PyObject *
+speedups_init(PyObject *module, PyObject *args)
+{
+    PyObject *missing, *field_map_func;
+
+    if (!PyArg_ParseTuple(args, "OO:init", &missing, &field_map_func)) {
+        return NULL;
+    }
+    Py_INCREF(missing);
+    Py_XSETREF(MISSING, missing);
+    Py_INCREF(field_map_func);
+    Py_XSETREF(FIELD_MAP, field_map_func);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+speedups_lookup_attr(PyObject *module, PyObject *args)
+{
+    PyObject *item, *attr_name, *iterator, *i, *multi_items;
+    int is_multi;
+
+    if (!PyArg_ParseTuple(args, "OpO:lookup_attr", &item, &is_multi, &attr_name)) {
+        return NULL;
+    }
+    if (MISSING == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "init() has not been called");
+        return NULL;
+    }
+    if (!is_multi) {
+        return single_attr(item, attr_name);
+    }
+
+    multi_items = PyList_New(0);
+    if (multi_items == NULL) {
+        return NULL;
+    }
+    iterator = PyObject_GetIter(item);
+    if (iterator == NULL) {
+        Py_DECREF(multi_items);
+        return NULL;
+    }
+    while ((i = PyIter_Next(iterator)) != NULL) {
+        PyObject *lookup = single_attr(i, attr_name);
+        Py_DECREF(i);
+        if (lookup == NULL || append_flattened(multi_items, lookup) < 0) {
+            Py_DECREF(iterator);
+            Py_DECREF(multi_items);
+            return NULL;
+        }
+    }
+    Py_DECREF(iterator);
+    if (PyErr_Occurred()) {
+        Py_DECREF(multi_items);
+        return NULL;
+    }
+    return as_tuple(multi_items);
+}
+
+static PyObject *
+speedups_lookup_item(PyObject *module, PyObject *args)
+{
+    PyObject *item, *key, *iterator, *i, *multi_items, *lookup;
+    int is_multi;
+
+    if (!PyArg_ParseTuple(args, "OpO:lookup_item", &item, &is_multi, &key)) {
+        return NULL;
+    }
+    if (MISSING == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "init() has not been called");
+        return NULL;
+    }
+
+    /* Lookup slices in all cases, and flag the result has multiple items */
+    if (PySlice_Check(key)) {
+        lookup = try_getitem(item, key);
+        return lookup == NULL ? NULL : Py_BuildValue("(NO)", lookup, Py_True);
+    }
+
+    if (!is_multi) {
+        lookup = single_item(item, key);
+        return lookup == NULL ? NULL : Py_BuildValue("(NO)", lookup, Py_False);
+    }
+
+    /* Select the n-th of multiple items, which is no longer multiple items */
+    if (PyLong_Check(key)) {
+        lookup = try_getitem(item, key);
+        return lookup == NULL ? NULL : Py_BuildValue("(NO)", lookup, Py_False);
+    }
+
+    multi_items = PyList_New(0);
+    if (multi_items == NULL) {
+        return NULL;
+    }
+    iterator = PyObject_GetIter(item);
+    if (iterator == NULL) {
+        Py_DECREF(multi_items);
+        return NULL;
+    }
+    while ((i = PyIter_Next(iterator)) != NULL) {
+        lookup = single_item(i, key);
+        Py_DECREF(i);
+        if (lookup == NULL || append_flattened(multi_items, lookup) < 0) {
+            Py_DECREF(iterator);
+            Py_DECREF(multi_items);
+            return NULL;
+        }
+    }
+    Py_DECREF(iterator);
+    if (PyErr_Occurred()) {
+        Py_DECREF(multi_items);
+        return NULL;
+    }
+    lookup = as_tuple(multi_items);
+    return lookup == NULL ? NULL : Py_BuildValue("(NO)", lookup, Py_True);
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"init", speedups_init, METH_VARARGS,
+     "init(missing, field_map)\n\nSet the MISSING marker and field map function."},
+    {"lookup_attr", speedups_lookup_attr, METH_VARARGS,
+     "lookup_attr(item, is_multi, attr_name) -> result"},
+    {"lookup_item", speedups_lookup_item, METH_VARARGS,
+     "lookup_item(item, is_multi, key_or_index_or_slice) -> (result, is_multi)"},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "_roam_speedups",
+    "Accelerated core lookup functions for roam",
+    -1,
+    speedups_methods,
+};
+
+PyMODINIT_FUNC
+PyInit__roam_speedups(void)
+{
+    return PyModule_Create(&speedups_module);
+}
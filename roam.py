@@ -1,7 +1,40 @@
 """ Easily traverse nested Python data structures """
 
+import itertools
+
 __version__ = "0.3.1"
 
+# Optional engines are imported on first access as ``roam.<name>`` attributes,
+# instead of when **roam** itself is imported, to keep ``import roam`` cheap.
+# Maps attribute name to the module to import for it.
+_LAZY_MODULES = {}
+
+
+def __getattr__(name):
+    module_name = _LAZY_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    module = importlib.import_module(module_name)
+    globals()[name] = module  # Skip this hook on subsequent lookups
+    return module
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MODULES))
+
+
+# Maximum number of keys or attrs to list in hints of a path description, can
+# be overridden per shim with the ``_hint_limit`` option
+HINT_LIMIT = 30
+# Maximum number of keys or attrs to search for close matches to a missing step
+HINT_SAMPLE_SIZE = 100
+# Levels of references, and maximum number of objects, searched from a result
+# to check it does not refer back to its object before ``RoamMemo`` caches it
+MEMO_REFERENCE_DEPTH = 3
+MEMO_REFERENCE_LIMIT = 1000
+
 
 class _RoamMissingItem:
     """ Falsey class used to flag item "missing" from traversal path """
@@ -25,38 +58,144 @@ class _RoamMissingItem:
 MISSING = _RoamMissingItem()
 
 
+def _describe_op(op: str, key) -> str:
+    """
+    Return the text description of a single path step operation, as it would
+    be expressed in Python syntax like ``.name`` or ``["key"]`` or ``[1:]``
+    """
+    if op == "getattr":
+        return f".{key}"
+    if isinstance(key, slice):
+        return (
+            f"[{key.start or ''}:{key.stop or ''}"
+            f"{':' + str(key.step) if key.step else ''}]"
+        )
+    return f"[{key!r}]"
+
+
+# Stand-in for keys that cannot be hashed in the hashable form of path steps
+_UNHASHABLE_KEY = object()
+
+
+def _hashable_op(op: str, key) -> tuple:
+    """
+    Return a hashable form of a path step operation. Required because
+    ``slice`` objects are not hashable prior to Python 3.12, and other keys
+    like a ``list`` may never be. Equal keys must hash the same, so all such
+    keys share a single stand-in.
+    """
+    if isinstance(key, slice):
+        return op, (key.start, key.stop, key.step)
+    try:
+        hash(key)
+    except TypeError:
+        return op, _UNHASHABLE_KEY
+    return op, key
+
+
+def _hint_names(names, count, missing_key, limit: int, fmt=str) -> str:
+    """
+    Return a ``[a, b, c]`` hint listing at most ``limit`` of the given names,
+    without consuming the rest of the iterable. If names were left out, also
+    list any close matches to the missing key among a sample of names.
+    """
+    names = iter(names)
+    # Take one extra name to find out whether any names are left out
+    shown = list(itertools.islice(names, limit + 1))
+    if len(shown) <= limit:
+        return f"[{', '.join(fmt(n) for n in shown)}]"
+
+    names = itertools.chain(shown[limit:], names)
+    shown = shown[:limit]
+    hint = ", ".join(fmt(n) for n in shown)
+    if count is None:
+        hint = f"[{hint}, ...]"
+    else:
+        hint = f"[{hint}, ...and {count - len(shown)} more]"
+    if isinstance(missing_key, str):
+        import difflib
+
+        # Skip names too short or too long to ever be a close match, which is
+        # much cheaper than having `difflib` score them
+        min_len, max_len = len(missing_key) * 3 / 7, len(missing_key) * 7 / 3
+        sample = [
+            n
+            for n in itertools.islice(itertools.chain(shown, names), HINT_SAMPLE_SIZE)
+            if isinstance(n, str) and min_len <= len(n) <= max_len
+        ]
+        matches = difflib.get_close_matches(missing_key, sample)
+        if matches:
+            hint += f" closest matches [{', '.join(fmt(n) for n in matches)}]"
+    return hint
+
+
 class _Path:
     _r_root_item_ = None
-    _r_steps_ = []
+    _r_hint_limit_ = None
+    # Parent path, index, and element for a path to an iterated element
+    _r_iter_parent_ = None
+    # Whether the path passes through the result of calling a shim
+    _r_called_ = False
 
     def __init__(self, initial_item, path_to_clone=None):
         if path_to_clone is not None:
             self._r_root_item_ = path_to_clone._r_root_item_
-            self._r_steps_ = list(path_to_clone._r_steps_)  # Shallow copy list
+            if path_to_clone._r_iter_parent_ is not None:
+                # Build new lists once instead of copying the element path's
+                self._r_steps_, self._r_ops_ = path_to_clone._iter_steps_and_ops()
+            else:
+                self._r_steps_ = list(path_to_clone._r_steps_)  # Shallow copy list
+                self._r_ops_ = list(path_to_clone._r_ops_)
+            self._r_hint_limit_ = path_to_clone._r_hint_limit_
+            self._r_called_ = path_to_clone._r_called_
         else:
             self._r_root_item_ = initial_item
             self._r_steps_ = []
+            self._r_ops_ = []
+
+    def __getattr__(self, name):
+        # Build steps for the path to an iterated element only when needed
+        if name in ("_r_steps_", "_r_ops_") and self._r_iter_parent_ is not None:
+            self._r_steps_, self._r_ops_ = self._iter_steps_and_ops()
+            self._r_iter_parent_ = None
+            return getattr(self, name)
+        raise AttributeError(name)
+
+    def _iter_steps_and_ops(self):
+        # New steps and ops lists for the path to an iterated element
+        parent, index, element = self._r_iter_parent_
+        op = ("getitem", index)
+        return parent._r_steps_ + [(_describe_op(*op), element)], parent._r_ops_ + [op]
+
+    def element_path(self, index: int, element) -> "_Path":
+        """
+        Return the path to the element at ``index`` found by iterating over
+        the data at this path, without copying this path's steps until needed.
+        """
+        path = _Path.__new__(_Path)
+        path._r_root_item_ = self._r_root_item_
+        path._r_hint_limit_ = self._r_hint_limit_
+        path._r_called_ = self._r_called_
+        path._r_iter_parent_ = (self, index, element)
+        return path
 
     def log_getattr(self, attr_name: str, roamer: "Roamer"):
         """
         Log the fact that a ``.dot`` attribute lookup was performed using a
         given name and the given ``Roamer`` shim was produced.
         """
-        self._r_steps_.append((f".{attr_name}", unwrap(roamer)))
+        op = ("getattr", attr_name)
+        self._r_steps_.append((_describe_op(*op), unwrap(roamer)))
+        self._r_ops_.append(op)
 
     def log_getitem(self, slice_value: slice, roamer: "Roamer"):
         """
         Log the fact that a ``["slice"]`` attribute lookup was performed using a
         given slice value and the given ``Roamer`` shim was produced.
         """
-        if isinstance(slice_value, slice):
-            item_desc = (
-                f"[{slice_value.start or ''}:{slice_value.stop or ''}"
-                f"{slice_value.step and ':' + slice_value.step or ''}]"
-            )
-        else:
-            item_desc = f"[{slice_value!r}]"
-        self._r_steps_.append((item_desc, unwrap(roamer)))
+        op = ("getitem", slice_value)
+        self._r_steps_.append((_describe_op(*op), unwrap(roamer)))
+        self._r_ops_.append(op)
 
     def _last_found(self):
         last_found_step = None, None, self._r_root_item_
@@ -83,6 +222,9 @@ class _Path:
           invalid (if applicable)
         """
         result = []
+        hint_limit = self._r_hint_limit_
+        if hint_limit is None:
+            hint_limit = HINT_LIMIT
 
         first_missing_index, first_missing_desc, _ = self._first_missing()
         if first_missing_index:
@@ -99,7 +241,14 @@ class _Path:
                 result.append(f" at <{type(last_found_data).__name__}>")
 
                 # Generate hints
-                if isinstance(last_found_data, (tuple, list, set, range)):
+                _, missing_key = self._r_ops_[first_missing_index - 1]
+                fields = _field_map(type(last_found_data))
+                if isinstance(missing_key, str) and fields:
+                    # List fields of namedtuples, dataclasses etc without `dir()`
+                    attrs = [a for a in fields if not a.startswith("_")]
+                    hint = _hint_names(attrs, len(attrs), missing_key, hint_limit)
+                    result.append(f" with attrs {hint}")
+                elif isinstance(last_found_data, (tuple, list, set, range)):
                     # Detect an integer key slice operation like `[3]` or `[-2]`
                     if first_missing_desc[0] == "[" and first_missing_desc[-1] == "]":
                         try:
@@ -115,28 +264,581 @@ class _Path:
                     try:
                         keys = last_found_data.keys()
                         if keys:
-                            result.append(
-                                f" with keys [{', '.join([repr(k) for k in keys])}]"
+                            try:
+                                count = len(keys)
+                            except TypeError:
+                                count = None
+                            hint = _hint_names(
+                                keys, count, missing_key, hint_limit, fmt=repr
                             )
+                            result.append(f" with keys {hint}")
                     except AttributeError:
                         attrs = dir(last_found_data)
                         if attrs and not isinstance(
                             last_found_data, (str, tuple, list)
                         ):
-                            result.append(
-                                f" with attrs [{', '.join([a for a in attrs if not a.startswith('_')])}]"
+                            attrs = [a for a in attrs if not a.startswith("_")]
+                            hint = _hint_names(
+                                attrs, len(attrs), missing_key, hint_limit
                             )
+                            result.append(f" with attrs {hint}")
 
         return "".join(result)
 
     def __eq__(self, other):
+        # Compare the identity of root data and the step operations, not the
+        # data itself, so the cost does not grow with the size of the data
         if isinstance(other, _Path):
             return (
-                self._r_root_item_ == other._r_root_item_
-                and self._r_steps_ == other._r_steps_
+                self._r_root_item_ is other._r_root_item_
+                and self._r_ops_ == other._r_ops_
             )
         return False
 
+    def __hash__(self):
+        return hash(
+            (id(self._r_root_item_), tuple(_hashable_op(*op) for op in self._r_ops_))
+        )
+
+
+class RoamPath:
+    """
+    A data-free sequence of path steps, extracted from a ``Roamer`` shim with
+    ``path_of()``, that can be re-applied to other data.
+
+    Unlike a ``Roamer`` a ``RoamPath`` holds only the names, keys, and slices
+    of the path steps and none of the data, so it pickles compactly for
+    shipping to worker processes.
+    """
+
+    __slots__ = ("_r_ops_", "_r_hints_")
+
+    def __init__(self, ops=(), _hints=None):
+        self._r_ops_ = tuple(ops)
+        # Per step, whether to try the alternate lookup strategy first
+        self._r_hints_ = None if _hints is None else tuple(_hints)
+
+    def roam(self, item, _raise: bool = None) -> "Roamer":
+        """
+        Apply this path to the given data and return the resulting ``Roamer``
+        shim, exactly as if the path steps had been expressed on ``r(item)``
+        """
+        roamer = Roamer(item, _raise=_raise)
+        for op, key in self._r_ops_:
+            if op == "getattr":
+                roamer = getattr(roamer, key)
+            else:
+                roamer = roamer[key]
+        return roamer
+
+    def __call__(self, item, _raise: bool = False) -> object:
+        """
+        Apply this path to the given data and return the underlying result, or
+        ``MISSING``, as ``unwrap()`` would.
+        """
+        result = self.resolve(item)
+        if _raise and result is MISSING:
+            raise RoamPathException(self.roam(item)._r_path_)
+        return result
+
+    def resolve(self, item) -> object:
+        """
+        Apply this path to the given data and return the underlying result, or
+        ``MISSING``, without building ``Roamer`` shims or a path description.
+        """
+        is_multi = False
+        hints = self._r_hints_ or ()
+        for index, (op, key) in enumerate(self._r_ops_):
+            if item is MISSING:
+                break
+            if index < len(hints) and hints[index]:
+                item = _lookup_alternate_first(item, is_multi, op, key)
+            elif op == "getattr":
+                item = _lookup_attr(item, is_multi, key)
+            else:
+                item, is_multi = _lookup_item(item, is_multi, key)
+        return item
+
+    def specialize(self, trace: "RoamTrace") -> "RoamPath":
+        """
+        Return a copy of this path specialized for the shape of data seen in
+        a ``RoamTrace`` of this path, using only the records of lookups along
+        this same path, so ``resolve()``, ``iter_results()`` and the methods
+        built on them try the lookup
+        strategy that worked first at steps where the usual strategy always
+        failed: ``item["xyz"]`` for a ``.xyz`` step on dicts, and ``item.xyz``
+        for a ``["xyz"]`` step on objects.
+
+        A specialized path gives the same results for data shaped like the
+        traced data, but may not for data where both kinds of lookup work.
+        """
+        hints = [False] * len(self._r_ops_)
+        for step in trace.summary():
+            index = step["index"]
+            if step["ops"] != self._r_ops_[: index + 1]:
+                continue  # Lookups along another path
+            op, key = self._r_ops_[index]
+            if not isinstance(key, str):
+                continue  # Only names can be looked up as both attrs and items
+            if op == "getattr":
+                usual, alternate = ("attr",), "item_fallback"
+            else:
+                usual, alternate = ("item", "field"), "attr_fallback"
+            strategies = step["strategies"]
+            hints[index] = alternate in strategies and not any(
+                strategy in strategies for strategy in usual
+            )
+        return RoamPath(self._r_ops_, hints if any(hints) else None)
+
+    def iter_results(self, item):
+        """
+        Lazily apply this path to the given data and yield each result, in the
+        same order as the tuple result of a path through collections, without
+        building intermediate tuples for every step.
+
+        A path with a single result, not through collections, yields that one
+        result unless it is ``MISSING``.
+        """
+        items = None  # Iterator of multiple items, once the path has a slice
+        hints = self._r_hints_ or ()
+        for index, (op, key) in enumerate(self._r_ops_):
+            alternate_first = index < len(hints) and hints[index]
+            if items is None:
+                if item is MISSING:
+                    return
+                if alternate_first:
+                    item = _lookup_alternate_first(item, False, op, key)
+                elif op == "getattr":
+                    item = _lookup_attr(item, False, key)
+                elif isinstance(key, slice):
+                    items = _iter_slice(item, key)
+                else:
+                    item, _ = _lookup_item(item, False, key)
+            elif op == "getitem" and isinstance(key, slice):
+                items = _islice_results(items, key)
+            elif op == "getitem" and isinstance(key, int):
+                # Select just the n-th of multiple items
+                item = _iter_nth(items, key)
+                items = None
+            else:
+                items = _iter_lookup(items, op, key, alternate_first)
+
+        if items is None:
+            if item is not MISSING:
+                yield item
+        else:
+            yield from items
+
+    def count(self, item) -> int:
+        """
+        Return the number of results of this path in the given data.
+        """
+        return sum(1 for _ in self.iter_results(item))
+
+    def sum(self, item, start=0):
+        """
+        Return the sum of results of this path in the given data.
+        """
+        return sum(self.iter_results(item), start)
+
+    def min(self, item, default=MISSING):
+        """
+        Return the smallest result of this path in the given data, or
+        ``default`` if there are no results.
+        """
+        return min(self.iter_results(item), default=default)
+
+    def max(self, item, default=MISSING):
+        """
+        Return the largest result of this path in the given data, or
+        ``default`` if there are no results.
+        """
+        return max(self.iter_results(item), default=default)
+
+    def first(self, item, default=MISSING):
+        """
+        Return the first result of this path in the given data, or ``default``
+        if there are no results, without looking for further results.
+        """
+        return next(self.iter_results(item), default)
+
+    def any(self, item, predicate=None) -> bool:
+        """
+        Return whether any result of this path in the given data is truthy,
+        or passes ``predicate(result)`` if given, stopping at the first one.
+        """
+        if predicate is None:
+            return any(self.iter_results(item))
+        return any(predicate(result) for result in self.iter_results(item))
+
+    def distinct(self, item):
+        """
+        Yield the distinct results of this path in the given data, in order.
+        Unhashable results like lists are compared by equality instead, which
+        is slower for many distinct results.
+        """
+        seen = set()
+        seen_unhashable = []
+        for result in self.iter_results(item):
+            try:
+                if result in seen:
+                    continue
+                seen.add(result)
+            except TypeError:
+                if result in seen_unhashable:
+                    continue
+                seen_unhashable.append(result)
+            yield result
+
+    def group_by(self, item, key_path: "RoamPath", func=None, initial=0) -> dict:
+        """
+        Return a ``dict`` of results of this path in the given data grouped by
+        the result of ``key_path`` applied to each, which may be ``MISSING``.
+
+        By default the number of results in each group is returned. Otherwise
+        results are combined with ``func(total, result)`` starting from
+        ``initial`` for each group, as for ``functools.reduce()``.
+        """
+        groups = {}
+        for result in self.iter_results(item):
+            group = key_path.resolve(result)
+            total = groups.get(group, initial)
+            groups[group] = total + 1 if func is None else func(total, result)
+        return groups
+
+    def assign(self, item, value, _copy: bool = False) -> object:
+        """
+        Set ``value`` at every location this path reaches in the given data,
+        and return the data. See ``update()`` for details.
+        """
+        return _write(self, item, lambda _: value, _copy)
+
+    def update(self, item, func, _copy: bool = False) -> object:
+        """
+        Replace the value at every location this path reaches in the given
+        data with the result of ``func(value)``, and return the data.
+
+        Missing keys or attributes at the final step are created, in which
+        case ``func`` receives ``MISSING``. Earlier invalid steps, and final
+        steps where a value cannot be stored, raise a ``RoamPathException``
+        before any data is changed, except within collections where they are
+        skipped as they are when traversing.
+
+        Data is changed in place unless ``_copy`` is set, in which case only
+        the containers along the modified paths are copied and new data is
+        returned that shares everything else with the original.
+        """
+        return _write(self, item, func, _copy)
+
+    def __reduce__(self):
+        return (RoamPath, (self._r_ops_, self._r_hints_))
+
+    def __eq__(self, other):
+        if isinstance(other, RoamPath):
+            return self._r_ops_ == other._r_ops_
+        return False
+
+    def __hash__(self):
+        return hash(tuple(_hashable_op(*op) for op in self._r_ops_))
+
+    def __len__(self):
+        return len(self._r_ops_)
+
+    def __repr__(self):
+        return f"<RoamPath: {''.join(_describe_op(*op) for op in self._r_ops_)}>"
+
+
+def _iter_slice(item, key: slice):
+    """
+    Return an iterator over a slice of a single item, with the same results as
+    ``_lookup_item()`` but without copying sequences, or an empty iterator if
+    the item cannot be sliced.
+    """
+    if isinstance(item, (tuple, list, range)):
+        return (item[i] for i in range(len(item))[key])
+    lookup, _ = _lookup_item(item, False, key)
+    return iter(()) if lookup is MISSING else iter(lookup)
+
+
+def _islice_results(items, key: slice):
+    """
+    Return an iterator over a slice of an iterator of multiple results, which
+    does not consume more results than necessary.
+    """
+    if all(i is None or i >= 0 for i in (key.start, key.stop, key.step)):
+        return itertools.islice(items, key.start, key.stop, key.step)
+    return iter(tuple(items)[key])  # Negative indexes need all the results
+
+
+def _iter_nth(items, index: int) -> object:
+    """
+    Return the item at ``index`` in an iterator without keeping more items in
+    memory than necessary, or ``MISSING``.
+    """
+    if index >= 0:
+        return next(itertools.islice(items, index, None), MISSING)
+    from collections import deque
+
+    last_items = deque(items, maxlen=-index)
+    return last_items[0] if len(last_items) == -index else MISSING
+
+
+def _iter_lookup(items, op: str, key, alternate_first: bool = False):
+    """
+    Yield the flattened results of a lookup on each of multiple items, with
+    invalid lookups and ``None`` results omitted, as ``Roamer`` does, trying
+    the fallback strategy first if ``alternate_first`` is set.
+    """
+    for i in items:
+        if alternate_first:
+            lookup = _lookup_alternate_first(i, False, op, key)
+        elif op == "getattr":
+            lookup = _lookup_attr(i, False, key)
+        else:
+            lookup, _ = _lookup_item(i, False, key)
+        if isinstance(lookup, (tuple, list, range)):
+            yield from lookup
+        elif lookup is not None and lookup is not MISSING:
+            yield lookup
+
+
+def _lookup_alternate_first(item, is_multi: bool, op: str, key: str) -> object:
+    """
+    Return the result of a lookup like ``_lookup_attr()`` or ``_lookup_item()``
+    but trying the fallback strategy first, ``item["xyz"]`` for a ``.xyz``
+    lookup or ``item.xyz`` for a ``["xyz"]`` lookup, for each of multiple items
+    """
+    if is_multi:
+        multi_items = []
+        for i in item:
+            lookup = _lookup_alternate_first(i, False, op, key)
+            if isinstance(lookup, (tuple, list, range)):
+                multi_items += lookup
+            elif lookup is not None and lookup is not MISSING:
+                multi_items.append(lookup)
+        return tuple(multi_items)
+
+    try:
+        if op == "getattr":
+            return item[key]
+        return getattr(item, key)
+    except (TypeError, LookupError, AttributeError):
+        pass
+    if op == "getattr":
+        return _lookup_attr(item, False, key)
+    lookup, _ = _lookup_item(item, False, key)
+    return lookup
+
+
+class _Location:
+    """
+    Where a value was found while traversing a path to write data: the value,
+    the parent location, and whether it is an "item" or "attr" of the parent
+    """
+
+    __slots__ = ("parent", "how", "key", "value", "depth")
+
+    def __init__(self, parent, how, key, value):
+        self.parent = parent
+        self.how = how
+        self.key = key
+        self.value = value
+        self.depth = 0 if parent is None else parent.depth + 1
+
+
+def _locate(location: _Location, op: str, key) -> _Location:
+    """
+    Return the location of ``key`` within the given location's value, looked
+    up in the same way as ``Roamer`` would, or with a ``MISSING`` value.
+    """
+    node = location.value
+    if op == "getattr":
+        try:
+            return _Location(location, "attr", key, getattr(node, key))
+        except (TypeError, AttributeError):
+            pass
+    try:
+        return _Location(location, "item", key, node[key])
+    except (TypeError, LookupError):
+        pass
+    if op == "getitem" and not isinstance(key, int):
+        try:
+            return _Location(location, "attr", key, getattr(node, key))
+        except (TypeError, AttributeError):
+            pass
+    # Missing, so pick how a new value would be stored
+    if hasattr(node, "__setitem__") or not isinstance(key, str):
+        return _Location(location, "item", key, MISSING)
+    return _Location(location, "attr", key, MISSING)
+
+
+def _can_store(location: _Location, copy_on_write: bool) -> bool:
+    """
+    Return whether a value can be stored at the given location, checked before
+    any changes are made so a write does not leave data half-updated.
+    """
+    container = location.parent.value
+    if location.how == "item":
+        if copy_on_write and isinstance(container, tuple):
+            return location.value is not MISSING  # Only replace existing items
+        return hasattr(type(container), "__setitem__")
+    if isinstance(container, tuple):  # Only namedtuple fields, in copies
+        return copy_on_write and location.key in getattr(container, "_fields", ())
+    if getattr(getattr(container, "__dataclass_params__", None), "frozen", False):
+        return False
+    setattr_hook = getattr(type(container), "__setattr__", None)
+    if getattr(setattr_hook, "__name__", None) == "_frozen_setattrs":
+        return False  # Frozen attrs class
+    # Read-only properties and other descriptors on the class refuse writes
+    for klass in type(container).__mro__:
+        if location.key in vars(klass):
+            descriptor = vars(klass)[location.key]
+            if isinstance(descriptor, property):
+                return descriptor.fset is not None
+            if hasattr(type(descriptor), "__set__"):
+                return True
+            if hasattr(type(descriptor), "__delete__"):
+                return False
+            break
+    if hasattr(container, "__dict__"):
+        return True
+    fields = _field_map(type(container))
+    return fields is not None and location.key in fields
+
+
+def _store(container, changes: list, copy_on_write: bool) -> object:
+    """
+    Apply ``(how, key, value)`` changes to a container and return it, or
+    return a modified shallow copy of it if ``copy_on_write`` is set.
+    """
+    if copy_on_write:
+        if isinstance(container, tuple):
+            items = list(container)
+            attrs = {}
+            for how, key, value in changes:
+                if how == "item":
+                    items[key] = value
+                else:
+                    attrs[key] = value
+            if hasattr(container, "_make"):  # namedtuple
+                return container._make(items)._replace(**attrs)
+            return tuple(items)
+
+        import copy
+
+        container = copy.copy(container)
+    for how, key, value in changes:
+        if how == "item":
+            container[key] = value
+        else:
+            setattr(container, key, value)
+    return container
+
+
+def _write(path: RoamPath, item, func, copy_on_write: bool) -> object:
+    """
+    Find every location ``path`` reaches in ``item`` following the same rules
+    as ``Roamer``, replace the values there with ``func(value)``, and return
+    the (possibly copied) item.
+    """
+    locations = [_Location(None, None, None, item)]
+    is_multi = False
+    last_index = len(path._r_ops_) - 1
+    for i, (op, key) in enumerate(path._r_ops_):
+        was_multi = is_multi
+        if op == "getitem" and isinstance(key, slice):
+            if not is_multi:
+                node = locations[0].value
+                try:
+                    node[key]
+                    indexes = range(len(node))[key]
+                except (TypeError, LookupError):
+                    raise RoamPathException(path.roam(item)._r_path_)
+                locations = [
+                    _Location(locations[0], "item", index, node[index])
+                    for index in indexes
+                ]
+            else:
+                locations = locations[key]
+            is_multi = True
+        elif is_multi and op == "getitem" and isinstance(key, int):
+            try:
+                locations = [locations[key]]
+            except IndexError:
+                raise RoamPathException(path.roam(item)._r_path_)
+            is_multi = False
+        elif is_multi:
+            found = []
+            for location in locations:
+                location = _locate(location, op, key)
+                if i == last_index:
+                    found.append(location)
+                elif location.value is MISSING or location.value is None:
+                    pass  # Skip invalid paths within collections
+                elif isinstance(location.value, (tuple, list, range)):
+                    found += [
+                        _Location(location, "item", index, value)
+                        for index, value in enumerate(location.value)
+                    ]
+                else:
+                    found.append(location)
+            locations = found
+        else:
+            location = _locate(locations[0], op, key)
+            if location.value is MISSING and i != last_index:
+                raise RoamPathException(path.roam(item)._r_path_)
+            locations = [location]
+
+    if last_index < 0:
+        return func(item)
+
+    # Check every location before changing any data. Those that cannot be set
+    # are skipped within collections, as traversal skips invalid paths there
+    storable = [loc for loc in locations if _can_store(loc, copy_on_write)]
+    if len(storable) < len(locations):
+        if not was_multi:
+            raise RoamPathException(path.roam(item)._r_path_)
+        locations = storable
+
+    # Apply changes to data directly, or to copies of only the containers along
+    # the modified paths by working back up from the deepest changes to the root
+    changes_by_parent = {}
+    for location in locations:
+        parent_changes = changes_by_parent.setdefault(
+            id(location.parent), (location.parent, [])
+        )
+        parent_changes[1].append((location.how, location.key, func(location.value)))
+    if not copy_on_write:
+        for parent, changes in changes_by_parent.values():
+            _store_or_raise(path, item, parent.value, changes, copy_on_write)
+        return item
+
+    while changes_by_parent:
+        deepest = max(parent.depth for parent, _ in changes_by_parent.values())
+        for parent_id, (parent, changes) in list(changes_by_parent.items()):
+            if parent.depth != deepest:
+                continue
+            del changes_by_parent[parent_id]
+            new_value = _store_or_raise(path, item, parent.value, changes, True)
+            if parent.parent is None:
+                return new_value
+            grandparent_changes = changes_by_parent.setdefault(
+                id(parent.parent), (parent.parent, [])
+            )
+            grandparent_changes[1].append((parent.how, parent.key, new_value))
+    return item
+
+
+def _store_or_raise(path: RoamPath, item, container, changes, copy_on_write):
+    """
+    Return the result of ``_store()``, raising a ``RoamPathException`` for
+    ``path`` in ``item`` if the container refuses the changes
+    """
+    try:
+        return _store(container, changes, copy_on_write)
+    except (TypeError, AttributeError, LookupError):
+        raise RoamPathException(path.roam(item)._r_path_)
+
 
 class RoamPathException(Exception):
     """
@@ -155,27 +857,597 @@ class RoamPathException(Exception):
         return f"<RoamPathException: {self.path.description()}>"
 
 
+# Field maps of classes by class id, see `_field_map()`, and weak references
+# to the classes to forget their field maps when they go away
+_FIELD_MAPS = {}
+_FIELD_MAP_REFS = {}
+
+
+def _field_map(cls: type) -> dict:
+    """
+    Return a ``{name: index}`` map of the fields of a namedtuple class, or a
+    ``{name: None}`` map of the fields of a dataclass, attrs, or ``__slots__``
+    class, so fields can be looked up directly instead of trying and failing
+    to look them up as items first. Return ``None`` for other classes,
+    including those that support item lookups.
+    """
+    try:
+        return _FIELD_MAPS[id(cls)]
+    except KeyError:
+        pass
+
+    fields = None
+    if issubclass(cls, tuple):
+        if hasattr(cls, "_fields") and cls.__getitem__ is tuple.__getitem__:
+            fields = {name: index for index, name in enumerate(cls._fields)}
+    elif not hasattr(cls, "__getitem__"):
+        names = []
+        if hasattr(cls, "__dataclass_fields__"):
+            import dataclasses  # Already imported to define the class
+
+            # Only real fields, not `InitVar` or `ClassVar` pseudo-fields
+            names += [f.name for f in dataclasses.fields(cls)]
+        names += [a.name for a in getattr(cls, "__attrs_attrs__", ())]
+        for klass in cls.__mro__:
+            slots = vars(klass).get("__slots__", ())
+            names += [slots] if isinstance(slots, str) else slots
+        names = [n for n in names if n not in ("__dict__", "__weakref__")]
+        if names:
+            fields = dict.fromkeys(names)
+
+    # Don't keep classes created on the fly alive, or their field maps after
+    import weakref
+
+    cls_id = id(cls)
+    _FIELD_MAP_REFS[cls_id] = weakref.ref(
+        cls, lambda _, cls_id=cls_id: _forget_field_map(cls_id)
+    )
+    _FIELD_MAPS[cls_id] = fields
+    return fields
+
+
+def _forget_field_map(cls_id: int):
+    _FIELD_MAPS.pop(cls_id, None)
+    _FIELD_MAP_REFS.pop(cls_id, None)
+
+
+def _get_field(item, index: int, name: str, _getattr=getattr) -> object:
+    """
+    Return a field found by ``_field_map()`` by its index in a namedtuple, or
+    by name, or ``MISSING`` if it is not set.
+    """
+    if index is not None:
+        return item[index]
+    try:
+        return _getattr(item, name)
+    except (TypeError, AttributeError):
+        return MISSING
+
+
+def _note_strategy(strategies: dict, strategy: str):
+    """
+    Count a lookup strategy used by ``_py_lookup_attr()`` or ``_py_lookup_item()``
+    """
+    strategies[strategy] = strategies.get(strategy, 0) + 1
+
+
+def _py_lookup_attr(
+    item, is_multi: bool, attr_name: str, _getattr=getattr, _strategies=None
+) -> object:
+    """
+    Return the result of a ``.dot`` lookup of ``attr_name`` on ``item``:
+    - for a single item, ``item.attr_name`` falling back to ``item[attr_name]``
+    - for multiple items, a flattened tuple of the lookup results for each item
+      with invalid lookups and ``None`` results omitted
+    - ``MISSING`` if there is no result
+
+    Attributes are looked up with ``_getattr``, which can be replaced to
+    memoize lookups. If a ``_strategies`` dict is given, the number of times
+    each lookup strategy was used is counted in it.
+    """
+    # Multi-item: `.xyz` => `(i.xyz for i in item)`
+    if is_multi:
+        multi_items = []
+        for i in item:
+            lookup = None
+            try:
+                lookup = _getattr(i, attr_name)
+                strategy = "attr"
+            except (TypeError, AttributeError):
+                try:
+                    lookup = i[attr_name]
+                    strategy = "item_fallback"
+                except (TypeError, LookupError):
+                    strategy = "missing"
+            if _strategies is not None:
+                _note_strategy(_strategies, strategy)
+            if isinstance(lookup, (tuple, list, range)):
+                multi_items += lookup
+            elif lookup is not None:
+                multi_items.append(lookup)
+        return tuple(multi_items)
+
+    # Single item: `.xyz` => `item.xyz`
+    try:
+        lookup = _getattr(item, attr_name)
+        strategy = "attr"
+    except (TypeError, AttributeError):
+        # Fall back to `item["xyz"]`
+        try:
+            lookup = item[attr_name]
+            strategy = "item_fallback"
+        except (TypeError, LookupError):
+            lookup = MISSING
+            strategy = "missing"
+    if _strategies is not None:
+        _note_strategy(_strategies, strategy)
+    return lookup
+
+
+def _py_lookup_item(
+    item, is_multi: bool, key_or_index_or_slice, _getattr=getattr, _strategies=None
+) -> tuple:
+    """
+    Return the result of a ``["slice"]`` lookup on ``item``, and whether that
+    result now holds multiple items, as a ``(result, is_multi)`` tuple:
+    - for a slice, the sliced item which now holds multiple items
+    - for a single item, ``item[key]`` falling back to ``item.key`` for
+      non-integer keys
+    - for multiple items and an integer index, the single n-th item
+    - for multiple items and other keys, a flattened tuple of the lookup
+      results for each item with invalid lookups and ``None`` results omitted
+    - ``MISSING`` if there is no result
+
+    Attributes are looked up with ``_getattr``, which can be replaced to
+    memoize lookups. If a ``_strategies`` dict is given, the number of times
+    each lookup strategy was used is counted in it.
+    """
+    # Lookup slices in all cases, and flag the fact the result has multiple items
+    if isinstance(key_or_index_or_slice, slice):
+        try:
+            lookup = item[key_or_index_or_slice]
+            strategy = "slice"
+        except (TypeError, LookupError):
+            lookup = MISSING
+            strategy = "missing"
+        if _strategies is not None:
+            _note_strategy(_strategies, strategy)
+        return lookup, True
+
+    # Multi-item: `[xyz]` => `(i[xyz] for i in item)`
+    if is_multi:
+        # Flatten item if we have selected a specific integer index, after
+        # which we are no longer in a multi-item
+        if isinstance(key_or_index_or_slice, int):
+            try:
+                lookup = item[key_or_index_or_slice]
+                strategy = "index"
+            except (TypeError, LookupError):
+                lookup = MISSING
+                strategy = "missing"
+            if _strategies is not None:
+                _note_strategy(_strategies, strategy)
+            return lookup, False
+        # Otherwise apply lookup to each of multiple items
+        multi_items = []
+        is_str_key = isinstance(key_or_index_or_slice, str)
+        for i in item:
+            lookup = None
+            fields = _field_map(type(i)) if is_str_key else None
+            if fields is not None and key_or_index_or_slice in fields:
+                lookup = _get_field(
+                    i, fields[key_or_index_or_slice], key_or_index_or_slice, _getattr
+                )
+                if lookup is MISSING:
+                    lookup = None
+                    strategy = "missing"
+                else:
+                    strategy = "field"
+            else:
+                try:
+                    lookup = i[key_or_index_or_slice]
+                    strategy = "item"
+                except (TypeError, LookupError):
+                    try:
+                        lookup = _getattr(i, key_or_index_or_slice)
+                        strategy = "attr_fallback"
+                    except (TypeError, AttributeError):
+                        strategy = "missing"
+            if _strategies is not None:
+                _note_strategy(_strategies, strategy)
+            if isinstance(lookup, (tuple, list, range)):
+                multi_items += lookup
+            elif lookup is not None:
+                multi_items.append(lookup)
+        return tuple(multi_items), True
+
+    # Single item with fields: `["xyz"]` => `item.xyz` without trying `item["xyz"]`
+    fields = None
+    if isinstance(key_or_index_or_slice, str):
+        fields = _field_map(type(item))
+    if fields is not None and key_or_index_or_slice in fields:
+        index = fields[key_or_index_or_slice]
+        lookup = _get_field(item, index, key_or_index_or_slice, _getattr)
+        strategy = "missing" if lookup is MISSING else "field"
+    else:
+        # Single item: `[xyz]` => `item[xyz]`
+        try:
+            lookup = item[key_or_index_or_slice]
+            strategy = "item"
+        except (TypeError, LookupError):
+            lookup = MISSING
+            strategy = "missing"
+            # Fall back to `item.xyz`, except for integer indexes that cannot be attrs
+            if not isinstance(key_or_index_or_slice, int):
+                try:
+                    lookup = _getattr(item, key_or_index_or_slice)
+                    strategy = "attr_fallback"
+                except (TypeError, AttributeError):
+                    pass
+    if _strategies is not None:
+        _note_strategy(_strategies, strategy)
+    return lookup, False
+
+
+# Use the optional ``_roam_speedups`` accelerator extension module for the core
+# lookup functions if it is installed, see ``setup_speedups.py``. It provides:
+# - ``init(missing, field_map)`` called once on import with the ``MISSING``
+#   marker and the ``_field_map()`` function
+# - ``lookup_attr(item, is_multi, attr_name) -> result``
+# - ``lookup_item(item, is_multi, key_or_index_or_slice) -> (result, is_multi)``
+# with semantics identical to ``_py_lookup_attr()`` and ``_py_lookup_item()``,
+# including looking up string keys on classes with a ``_field_map()`` as fields
+# instead of items. The ``_getattr`` and ``_strategies`` hooks are not needed:
+# shims with the ``_memo`` or ``_trace`` options use the pure-Python versions.
+_lookup_attr = _py_lookup_attr
+_lookup_item = _py_lookup_item
+try:
+    import _roam_speedups
+except ImportError:
+    _roam_speedups = None
+else:
+    _roam_speedups.init(MISSING, _field_map)
+    _lookup_attr = _roam_speedups.lookup_attr
+    _lookup_item = _roam_speedups.lookup_item
+
+
+class RoamMemo:
+    """
+    A cache of attribute lookups and call results on data objects, for shims
+    created with the ``_memo`` option to avoid repeating expensive work when
+    roaming the same paths through the same objects.
+
+    Results are cached by object identity, and only for objects that support
+    weak references so the cache does not keep your data alive. For the same
+    reason, results that refer back to their object, like bound methods, are
+    not cached. Only ``MEMO_REFERENCE_DEPTH`` levels of references, and at most
+    ``MEMO_REFERENCE_LIMIT`` objects, are searched from each result, so results
+    referring to their object more indirectly keep it alive until they are
+    evicted or the cache is cleared. At most ``maxsize`` results are kept,
+    discarding the least recently used, or unlimited results if ``maxsize`` is
+    ``None``.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        import gc
+        import weakref
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._weakref = weakref.ref
+        self._get_referents = gc.get_referents
+        self._unsearched_types = (type, type(gc))  # Classes and modules
+        # Cached values by `(id(obj), key)`, in least- to most-recently used order
+        self._cache = {}
+        # Weak reference to each object with cached values, and the cache keys
+        self._refs = {}
+        self._keys = {}
+
+    def getattr(self, obj, attr_name: str) -> object:
+        """
+        Return ``getattr(obj, attr_name)``, cached.
+        """
+        return self._lookup(obj, attr_name, getattr, (obj, attr_name))
+
+    def call(self, func, args: tuple, kwargs: dict) -> object:
+        """
+        Return ``func(*args, **kwargs)``, cached. Results of bound methods are
+        cached for the method's instance.
+        """
+        if hasattr(func, "__func__") and hasattr(func, "__self__"):
+            obj, key = func.__self__, (func.__func__, args, tuple(kwargs.items()))
+        else:
+            obj, key = func, (None, args, tuple(kwargs.items()))
+        return self._lookup(obj, key, lambda: func(*args, **kwargs), ())
+
+    def clear(self):
+        """
+        Discard all cached results and reset statistics.
+        """
+        self._cache.clear()
+        self._refs.clear()
+        self._keys.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __repr__(self):
+        return (
+            f"<RoamMemo: hits={self.hits} misses={self.misses}"
+            f" size={len(self)} maxsize={self.maxsize}>"
+        )
+
+    def _lookup(self, obj, key, compute, compute_args: tuple) -> object:
+        obj_id = id(obj)
+        cache_key = (obj_id, key)
+        try:
+            value = self._cache.pop(cache_key)
+        except KeyError:
+            pass
+        except TypeError:
+            return compute(*compute_args)  # Unhashable arguments cannot be cached
+        else:
+            self._cache[cache_key] = value  # Now the most recently used
+            self.hits += 1
+            return value
+
+        if obj_id not in self._refs:
+            try:
+                ref = self._weakref(obj, lambda _, obj_id=obj_id: self._forget(obj_id))
+            except TypeError:
+                return compute(*compute_args)  # Cannot detect when `obj` goes away
+        else:
+            ref = None
+        value = compute(*compute_args)
+        # Don't cache values like bound methods that refer back to the object,
+        # which would keep the object alive
+        if self._refers_to(value, obj):
+            return value
+        if ref is not None:
+            self._refs[obj_id] = ref
+            self._keys[obj_id] = set()
+
+        self.misses += 1
+        self._cache[cache_key] = value
+        self._keys[obj_id].add(cache_key)
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            oldest_key = next(iter(self._cache))
+            del self._cache[oldest_key]
+            oldest_keys = self._keys[oldest_key[0]]
+            oldest_keys.discard(oldest_key)
+            if not oldest_keys:
+                self._forget(oldest_key[0])
+        return value
+
+    def _refers_to(self, value, obj) -> bool:
+        # Search a limited number of objects reachable from `value`, skipping
+        # classes and modules since any instance they refer to is kept alive
+        # by them anyway
+        if value is obj:
+            return True
+        seen = {id(value)}
+        objects = [value]
+        for _ in range(MEMO_REFERENCE_DEPTH):
+            referents = []
+            for referent in self._get_referents(*objects):
+                if referent is obj:
+                    return True
+                if id(referent) in seen or isinstance(referent, self._unsearched_types):
+                    continue
+                seen.add(id(referent))
+                referents.append(referent)
+                if len(seen) > MEMO_REFERENCE_LIMIT:
+                    return False
+            objects = referents
+        return False
+
+    def _forget(self, obj_id: int):
+        for cache_key in self._keys.pop(obj_id, ()):
+            self._cache.pop(cache_key, None)
+        self._refs.pop(obj_id, None)
+
+
+class RoamTrace:
+    """
+    A record of the lookups performed by shims created with the ``_trace``
+    option, to show how each path step was actually resolved.
+
+    Each record is a ``dict`` with the path step ``index`` and description
+    ``step``, the ``op`` and ``key`` looked up, the ``ops`` of the path up to
+    and including the step and their description ``path``, a count of the
+    lookup ``strategies`` used for each item, the number of items going in to
+    and coming out of the step in ``items_in`` and ``items_out``, and the time
+    taken in ``seconds``.
+
+    Strategies are ``"attr"`` or ``"item"`` for direct lookups, ``"field"``
+    for namedtuple, dataclass, and similar fields, ``"item_fallback"`` or
+    ``"attr_fallback"`` when the other kind of lookup was needed, ``"slice"``
+    and ``"index"`` for slices of and indexes into multiple items, and
+    ``"missing"`` when nothing was found.
+    """
+
+    def __init__(self):
+        from time import perf_counter
+
+        self._clock = perf_counter
+        self.records = []
+
+    def summary(self) -> list:
+        """
+        Return a list of records combining all the lookups for each distinct
+        path up to a step, in order of the step index, with the strategy
+        counts, item counts, and times added together and the number of
+        lookups in ``lookups``.
+        """
+        steps = []
+        steps_by_hash = {}  # Steps with equal hashable ops, which may differ
+        for record in self.records:
+            bucket = steps_by_hash.setdefault(
+                tuple(_hashable_op(*op) for op in record["ops"]), []
+            )
+            for step in bucket:
+                if step["ops"] == record["ops"]:
+                    break
+            else:
+                step = dict(record, strategies={}, lookups=0)
+                step["items_in"] = step["items_out"] = step["seconds"] = 0
+                bucket.append(step)
+                steps.append(step)
+            for strategy, count in record["strategies"].items():
+                step["strategies"][strategy] = (
+                    step["strategies"].get(strategy, 0) + count
+                )
+            for field in ("items_in", "items_out", "seconds"):
+                step[field] += record[field]
+            step["lookups"] += 1
+        return sorted(steps, key=lambda step: step["index"])
+
+    def as_dicts(self) -> list:
+        """
+        Return a copy of the trace records as plain ``dict`` and ``list`` data
+        that can be exported as JSON. Slice keys become ``[start, stop, step]``
+        lists, tuple keys become lists, and keys other than strings, numbers,
+        booleans, and ``None`` become their ``repr()``.
+        """
+        return [
+            dict(
+                record,
+                key=_plain_key(record["key"]),
+                ops=[[op, _plain_key(key)] for op, key in record["ops"]],
+                strategies=dict(record["strategies"]),
+            )
+            for record in self.records
+        ]
+
+    def clear(self):
+        """
+        Discard all trace records.
+        """
+        self.records.clear()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        return f"<RoamTrace: records={len(self)}>"
+
+    def _record(self, ops: tuple, strategies, given, result, seconds):
+        op, key = ops[-1]
+        self.records.append(
+            {
+                "index": len(ops) - 1,
+                "step": _describe_op(op, key),
+                "op": op,
+                "key": key,
+                "ops": ops,
+                "path": "".join(_describe_op(*op) for op in ops),
+                "strategies": strategies,
+                "items_in": _count_items(*given),
+                "items_out": _count_items(*result),
+                "seconds": seconds,
+            }
+        )
+
+
+def _plain_key(key) -> object:
+    """
+    Return a path step key as plain data for ``RoamTrace.as_dicts()``
+    """
+    if key is None or isinstance(key, (str, int, float)):
+        return key
+    if isinstance(key, slice):
+        return [_plain_key(key.start), _plain_key(key.stop), _plain_key(key.step)]
+    if isinstance(key, tuple):
+        return [_plain_key(k) for k in key]
+    return repr(key)
+
+
+def _count_items(item, is_multi: bool) -> int:
+    """
+    Return the number of items in a lookup input or result
+    """
+    if item is MISSING:
+        return 0
+    if is_multi:
+        try:
+            return len(item)
+        except TypeError:
+            return 1
+    return 1
+
+
+class _Invoker:
+    """
+    Picklable callable to apply ``func(item, *args, **kwargs)`` to an item, or
+    call ``item(*args, **kwargs)`` if there is no ``func``, so calls can be
+    sent to process-based executors
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, item):
+        if self.func is None:
+            return item(*self.args, **self.kwargs)
+        return self.func(item, *self.args, **self.kwargs)
+
+
+class _ElementPath:
+    """
+    Build the path of a shim for an element found by iterating over another
+    shim when it is first read, then store it on the element shim itself
+    """
+
+    def __get__(self, roamer, owner):
+        if roamer is None:
+            return None
+        parent_path = roamer._r_parent_path_
+        if parent_path is None:
+            path = _Path(roamer._r_item_)
+        else:
+            path = parent_path.element_path(roamer._r_index_, roamer._r_item_)
+        roamer._r_path_ = path
+        return path
+
+
 class Roamer:
     """
     Act as a shim over your data objects, to intercept Python operations and do
     the extra work required to more easily traverse nested data.
     """
 
+    # Path and index within it for the path of an iterated element are kept in
+    # slots, so element shims stay small however many other shims exist
+    __slots__ = ("__dict__", "__weakref__", "_r_parent_path_", "_r_index_")
+
     # Internal state variables
     _r_item_ = None
-    _r_path_ = None
+    _r_path_ = _ElementPath()
     _r_is_multi_item_ = False
     # Options
     _r_raise_ = False
-    # Temporary flags
-    _r_via_alternate_lookup_ = False
-    _r_item__iter = None
+    _r_memo_ = None
+    _r_trace_ = None
 
-    def __init__(self, item, _raise=None):
+    def __init__(self, item, _raise=None, _hint_limit=None, _memo=None, _trace=None):
         # Handle `item` that is itself a `Roamer`
         if isinstance(item, Roamer):
-            for attr in ("_r_item_", "_r_is_multi_item_", "_r_raise_"):
-                setattr(self, attr, getattr(item, attr))
+            self._r_item_ = item._r_item_
+            # Copy only state and options that differ from the class defaults
+            if item._r_is_multi_item_:
+                self._r_is_multi_item_ = True
+            if item._r_raise_:
+                self._r_raise_ = True
+            if item._r_memo_ is not None:
+                self._r_memo_ = item._r_memo_
+            if item._r_trace_ is not None:
+                self._r_trace_ = item._r_trace_
             self._r_path_ = _Path(item._r_item_, item._r_path_)
         else:
             self._r_item_ = item
@@ -183,52 +1455,35 @@ class Roamer:
         # Set or override raise flag if user provided a value
         if _raise is not None:
             self._r_raise_ = bool(_raise)
+        # Set or override the number of keys or attrs listed in path hints
+        if _hint_limit is not None:
+            self._r_path_._r_hint_limit_ = _hint_limit
+        # Set or override memoization of attribute lookups and calls
+        if _memo is True:
+            self._r_memo_ = RoamMemo()
+        elif _memo is not None:
+            self._r_memo_ = None if _memo is False else _memo
+        # Set or override tracing of lookups
+        if _trace is True:
+            self._r_trace_ = RoamTrace()
+        elif _trace is not None:
+            self._r_trace_ = None if _trace is False else _trace
 
     def __getattr__(self, attr_name):
         # Stop here if no item to traverse
         if self._r_item_ is MISSING:
-            if not self._r_via_alternate_lookup_:
-                self._r_path_.log_getattr(attr_name, self)
-            return self
+            copy = Roamer(self)
+            copy._r_path_.log_getattr(attr_name, copy)
+            return copy
 
         copy = Roamer(self)
-        # Multi-item: `.xyz` => `(i.xyz for i in item)`
-        if self._r_is_multi_item_:
-            multi_items = []
-            for i in self._r_item_:
-                lookup = None
-                try:
-                    lookup = getattr(i, attr_name)
-                except (TypeError, AttributeError):
-                    try:
-                        lookup = i[attr_name]
-                    except (TypeError, LookupError):
-                        pass
-                if isinstance(lookup, (tuple, list, range)):
-                    multi_items += lookup
-                elif lookup is not None:
-                    multi_items.append(lookup)
-            copy._r_item_ = tuple(multi_items)
-        # Single item: `.xyz` => `item.xyz`
+        if self._r_memo_ is None and self._r_trace_ is None:
+            copy._r_item_ = _lookup_attr(
+                self._r_item_, self._r_is_multi_item_, attr_name
+            )
         else:
-            try:
-                copy._r_item_ = getattr(copy._r_item_, attr_name)
-            except (TypeError, AttributeError):
-                # Attr lookup failed, no more attr lookup options
-                copy._r_item_ = MISSING
-
-        # Fall back to `self.__getitem__()` if lookup failed so far and we didn't come from there
-        if copy._r_item_ is MISSING and not self._r_via_alternate_lookup_:
-            try:
-                self._r_via_alternate_lookup_ = True
-                copy = self[attr_name]
-            except RoamPathException:
-                pass
-            finally:
-                copy._r_path_.log_getattr(attr_name, copy)
-                self._r_via_alternate_lookup_ = False
-        elif not self._r_via_alternate_lookup_:
-            copy._r_path_.log_getattr(attr_name, copy)
+            copy._r_item_, _ = self._r_lookup_("getattr", attr_name)
+        copy._r_path_.log_getattr(attr_name, copy)
 
         if copy._r_item_ is MISSING and copy._r_raise_:
             raise RoamPathException(copy._r_path_)
@@ -238,83 +1493,98 @@ class Roamer:
     def __getitem__(self, key_or_index_or_slice):
         # Stop here if no item to traverse
         if self._r_item_ is MISSING:
-            if not self._r_via_alternate_lookup_:
-                self._r_path_.log_getitem(key_or_index_or_slice, self)
-            return self
+            copy = Roamer(self)
+            copy._r_path_.log_getitem(key_or_index_or_slice, copy)
+            return copy
 
         copy = Roamer(self)
-        # Multi-item: `[xyz]` => `(i[xyz] for i in item)`
-        if copy._r_is_multi_item_ and not isinstance(key_or_index_or_slice, slice):
-            # Flatten item if we have selected a specific integer index
-            if isinstance(key_or_index_or_slice, int):
-                try:
-                    copy._r_item_ = copy._r_item_[key_or_index_or_slice]
-                except (TypeError, LookupError):
-                    copy._r_item_ = MISSING
-                # No longer in a multi-item if we have selected a specific index item
-                copy._r_is_multi_item_ = False
-            # Otherwise apply slice lookup to each of multiple items
-            else:
-                multi_items = []
-                for i in copy._r_item_:
-                    lookup = None
-                    try:
-                        lookup = i[key_or_index_or_slice]
-                    except (TypeError, LookupError):
-                        try:
-                            lookup = getattr(i, key_or_index_or_slice)
-                        except (TypeError, AttributeError):
-                            pass
-                    if isinstance(lookup, (tuple, list, range)):
-                        multi_items += lookup
-                    elif lookup is not None:
-                        multi_items.append(lookup)
-                copy._r_item_ = tuple(multi_items)
-        # Lookup for non-multi item data, or for slice lookups in all cases
+        if self._r_memo_ is None and self._r_trace_ is None:
+            copy._r_item_, copy._r_is_multi_item_ = _lookup_item(
+                self._r_item_, self._r_is_multi_item_, key_or_index_or_slice
+            )
         else:
-            try:
-                copy._r_item_ = copy._r_item_[key_or_index_or_slice]
-            except (TypeError, LookupError):
-                # Index lookup failed, no more index lookup options
-                copy._r_item_ = MISSING
-
-        # Flag the fact our item actually has multiple elements
-        if isinstance(key_or_index_or_slice, slice):
-            copy._r_is_multi_item_ = True
-
-        # Fall back to `self.__getattr__()` if lookup failed so far and we didn't come from there
-        if (
-            copy._r_item_ is MISSING
-            and not self._r_via_alternate_lookup_
-            # Cannot do an integer attr lookup
-            and not isinstance(key_or_index_or_slice, int)
-        ):
-            try:
-                self._r_via_alternate_lookup_ = True
-                copy = getattr(self, key_or_index_or_slice)
-            except RoamPathException:
-                pass
-            finally:
-                copy._r_path_.log_getitem(key_or_index_or_slice, copy)
-                self._r_via_alternate_lookup_ = False
-        elif not self._r_via_alternate_lookup_:
-            copy._r_path_.log_getitem(key_or_index_or_slice, copy)
+            copy._r_item_, copy._r_is_multi_item_ = self._r_lookup_(
+                "getitem", key_or_index_or_slice
+            )
+        copy._r_path_.log_getitem(key_or_index_or_slice, copy)
 
         if copy._r_item_ is MISSING and copy._r_raise_:
             raise RoamPathException(copy._r_path_)
 
         return copy
 
-    def __call__(self, *args, _raise=False, _roam=False, _invoke=None, **kwargs):
+    def _r_lookup_(self, op: str, key) -> tuple:
+        """
+        Return the ``(result, is_multi)`` of a lookup on this shim's data using
+        the pure-Python lookup functions, with memoization and tracing applied
+        as configured.
+        """
+        _getattr = getattr if self._r_memo_ is None else self._r_memo_.getattr
+        trace = self._r_trace_
+        if trace is None:
+            if op == "getattr":
+                lookup = _py_lookup_attr(
+                    self._r_item_, self._r_is_multi_item_, key, _getattr
+                )
+                return lookup, self._r_is_multi_item_
+            return _py_lookup_item(self._r_item_, self._r_is_multi_item_, key, _getattr)
+
+        strategies = {}
+        start = trace._clock()
+        if op == "getattr":
+            result = (
+                _py_lookup_attr(
+                    self._r_item_, self._r_is_multi_item_, key, _getattr, strategies
+                ),
+                self._r_is_multi_item_,
+            )
+        else:
+            result = _py_lookup_item(
+                self._r_item_, self._r_is_multi_item_, key, _getattr, strategies
+            )
+        seconds = trace._clock() - start
+        trace._record(
+            tuple(self._r_path_._r_ops_) + ((op, key),),
+            strategies,
+            (self._r_item_, self._r_is_multi_item_),
+            result,
+            seconds,
+        )
+        return result
+
+    def __call__(
+        self,
+        *args,
+        _raise=False,
+        _roam=False,
+        _invoke=None,
+        _invoke_each=None,
+        _executor=None,
+        _chunksize=1,
+        **kwargs,
+    ):
         if _raise and self._r_item_ is MISSING:
             raise RoamPathException(self._r_path_)
 
+        # A single item is treated as the only one of many by `_invoke_each`
+        if _invoke_each is not None and not self._r_is_multi_item_:
+            if _invoke_each is not True:
+                _invoke = _invoke_each
+            _invoke_each = None
+
+        if _invoke_each is not None:
+            call_result = self._r_invoke_each_(
+                _invoke_each, args, kwargs, _executor, _chunksize
+            )
         # If an explicit callable is provided, call `_invoke(item, x, y, z)`
-        if _invoke is not None:
+        elif _invoke is not None:
             call_result = _invoke(self._r_item_, *args, **kwargs)
         # If item is callable: `.(x, y, z)` => `item(x, y, z)`
         elif callable(self._r_item_):
-            call_result = self._r_item_(*args, **kwargs)
+            if self._r_memo_ is None:
+                call_result = self._r_item_(*args, **kwargs)
+            else:
+                call_result = self._r_memo_.call(self._r_item_, args, kwargs)
         # If item is not callable but we were given parameters, try to apply
         # them even though we know it won't work, to generate the appropriate
         # exception to let the user know their action failed
@@ -328,31 +1598,89 @@ class Roamer:
         if _roam:
             copy = Roamer(self)
             copy._r_item_ = call_result
+            copy._r_path_._r_called_ = True
             return copy
         return call_result
 
+    def _r_invoke_each_(self, func, args, kwargs, executor, chunksize):
+        """
+        Return a tuple of the results of ``func(i, x, y, z)`` for each of
+        multiple items, or of ``i(x, y, z)`` if ``func`` is ``True``, in order
+        and omitting ``MISSING`` results as traversal does. Calls are made via
+        ``executor.map()`` if an executor is given.
+        """
+        if self._r_item_ is MISSING:
+            return MISSING
+        invoker = _Invoker(None if func is True else func, args, kwargs)
+        if executor is None:
+            results = map(invoker, self._r_item_)
+        else:
+            results = executor.map(invoker, self._r_item_, chunksize=chunksize)
+        return tuple(result for result in results if result is not MISSING)
+
     def __iter__(self):
         try:
-            self._r_item__iter = iter(self._r_item_)
+            items = iter(self._r_item_)
         except (TypeError, AttributeError):
-            self._r_item__iter = None
-        return self
+            return
+        if (
+            self._r_raise_
+            or self._r_memo_ is not None
+            or self._r_trace_ is not None
+            or not isinstance(self._r_item_, (tuple, list, range))
+        ):
+            for index, item in enumerate(items):
+                yield self._r_element_(index, item)
+            return
+        # Fast path for the common case of a sequence and no options set
+        new_roamer = Roamer.__new__
+        path = self._r_path_
+        for index, item in enumerate(items):
+            element = new_roamer(Roamer)
+            element._r_item_ = item
+            element._r_parent_path_ = path
+            element._r_index_ = index
+            yield element
 
-    def __next__(self):
-        if self._r_item__iter is None:
-            raise StopIteration()
-        next_value = next(self._r_item__iter)
-        return Roamer(next_value)
+    def _r_element_(self, index: int, item) -> "Roamer":
+        """
+        Return a shim for an element found by iterating over this shim's data.
+        Elements of sequences get a path from this one with an index step.
+        """
+        element = Roamer.__new__(Roamer)
+        element._r_item_ = item
+        # Only set options that differ from the class defaults, and leave the
+        # path to be built by `_ElementPath` if it is ever needed
+        if self._r_raise_:
+            element._r_raise_ = True
+        if self._r_memo_ is not None:
+            element._r_memo_ = self._r_memo_
+        if self._r_trace_ is not None:
+            element._r_trace_ = self._r_trace_
+        if isinstance(self._r_item_, (tuple, list, range)):
+            element._r_parent_path_ = self._r_path_
+            element._r_index_ = index
+        else:
+            element._r_parent_path_ = None
+        return element
 
     def __eq__(self, other):
         if isinstance(other, Roamer):
-            for attr in ("_r_item_", "_r_path_", "_r_is_multi_item_", "_r_raise_"):
+            # Compare cheapest attributes first, and items by identity before
+            # falling back to a potentially deep equality check
+            for attr in ("_r_is_multi_item_", "_r_raise_", "_r_path_"):
                 if getattr(other, attr) != getattr(self, attr):
                     return False
-            return True
+            return other._r_item_ is self._r_item_ or other._r_item_ == self._r_item_
         else:
             return other == self._r_item_
 
+    def __hash__(self):
+        # Hash only the path, which is cheap, not the underlying data which may
+        # not be hashable. Beware that shims compare equal to their underlying
+        # data but do not hash the same, so don't mix the two as dict keys
+        return hash(self._r_path_)
+
     def __bool__(self):
         return bool(self._r_item_)
 
@@ -369,20 +1697,82 @@ class Roamer:
         return f"<Roamer: {self._r_path_.description()} => {self._r_item_!r}>"
 
 
-def r(item: object, _raise: bool = None) -> Roamer:
+def r(
+    item: object,
+    _raise: bool = None,
+    _hint_limit: int = None,
+    _memo: "RoamMemo" = None,
+    _trace: "RoamTrace" = None,
+) -> Roamer:
     """
     A shorter alias for constructing a ``Roamer`` shim class.
     """
-    return Roamer(item, _raise=_raise)
+    return Roamer(
+        item, _raise=_raise, _hint_limit=_hint_limit, _memo=_memo, _trace=_trace
+    )
 
 
-def r_strict(item: object) -> Roamer:
+def r_strict(
+    item: object,
+    _hint_limit: int = None,
+    _memo: "RoamMemo" = None,
+    _trace: "RoamTrace" = None,
+) -> Roamer:
     """
     A shorter alias for constructing a ``Roamer`` shim class in "strict" mode,
     which means that the ``_raise`` flag set so the shim will immediately raise
     a ``RoamPathException`` when you express an invalid path step.
     """
-    return Roamer(item, _raise=True)
+    return Roamer(
+        item, _raise=True, _hint_limit=_hint_limit, _memo=_memo, _trace=_trace
+    )
+
+
+def assign(roamer: Roamer, value, _copy: bool = False) -> object:
+    """
+    Set ``value`` at every location the path of the given ``Roamer`` shim
+    reaches within its root data, and return the root data.
+
+    The data is changed in place unless ``_copy`` is set, in which case only
+    the containers along the modified paths are copied and new root data is
+    returned. See ``RoamPath.update()`` for details.
+    """
+    return path_of(roamer).assign(roamer._r_path_._r_root_item_, value, _copy=_copy)
+
+
+def update(roamer: Roamer, func, _copy: bool = False) -> object:
+    """
+    Replace the value at every location the path of the given ``Roamer`` shim
+    reaches within its root data with ``func(value)``, and return the root.
+
+    The data is changed in place unless ``_copy`` is set, in which case only
+    the containers along the modified paths are copied and new root data is
+    returned. See ``RoamPath.update()`` for details.
+    """
+    return path_of(roamer).update(roamer._r_path_._r_root_item_, func, _copy=_copy)
+
+
+def iter_paths(roamer: Roamer, path: RoamPath, _raise: bool = None):
+    """
+    Apply the data-free ``RoamPath`` to each element of the data in the given
+    ``Roamer`` shim and yield the results, or ``MISSING`` for elements where
+    the path is invalid, without building a shim for every element.
+
+    If ``_raise`` is set, or the shim has the ``_raise`` option set, raise a
+    ``RoamPathException`` describing the full path to the invalid element.
+    """
+    if _raise is None:
+        _raise = roamer._r_raise_
+    try:
+        items = iter(roamer._r_item_)
+    except (TypeError, AttributeError):
+        return
+    for index, item in enumerate(items):
+        result = path.resolve(item)
+        if result is MISSING and _raise:
+            # Repeat the lookup with shims to describe the path to the element
+            raise RoamPathException(path.roam(roamer._r_element_(index, item))._r_path_)
+        yield result
 
 
 def unwrap(roamer: Roamer, _raise: bool = None) -> object:
@@ -398,3 +1788,17 @@ def unwrap(roamer: Roamer, _raise: bool = None) -> object:
     if _raise and result is MISSING:
         raise RoamPathException(roamer._r_path_)
     return result
+
+
+def path_of(roamer: Roamer) -> RoamPath:
+    """
+    Return a data-free ``RoamPath`` with the steps taken to reach the given
+    ``Roamer`` shim, ready to be pickled and re-applied to other data.
+
+    Only ``.dot`` and ``["slice"]`` steps can be captured, so a ``ValueError``
+    is raised for a shim reached via the result of calling a shim with
+    ``_roam=True``, which a ``RoamPath`` cannot replay.
+    """
+    if roamer._r_path_._r_called_:
+        raise ValueError("Cannot get a path to a shim reached via a call")
+    return RoamPath(roamer._r_path_._r_ops_)
@@ -0,0 +1,19 @@
+"""
+Build the optional ``_roam_speedups`` accelerator extension module, which
+**roam** uses for its core lookups when it is installed:
+
+    python setup_speedups.py build_ext --inplace
+
+**roam** itself is pure Python and is packaged with flit, which cannot build
+extension modules, so the accelerator is built separately with setuptools.
+"""
+
+from setuptools import Extension, setup
+
+setup(
+    name="roam-speedups",
+    version="0.3.1",
+    description="Optional accelerator for the core lookups of roam",
+    ext_modules=[Extension("_roam_speedups", ["_roam_speedups.c"])],
+    python_requires=">=3.6",
+)
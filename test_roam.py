@@ -1,6 +1,84 @@
+import collections
+import concurrent.futures
+import copy
+import gc
+import importlib.util
+import json
+import os
+import pickle
+import py_compile
+import subprocess
+import sys
+import tracemalloc
+import types
+import typing
+import weakref
+
 import pytest
 
-from roam import r, r_strict, MISSING, Roamer, RoamPathException
+import roam
+
+from roam import (
+    r,
+    r_strict,
+    assign,
+    iter_paths,
+    path_of,
+    update,
+    MISSING,
+    Roamer,
+    RoamMemo,
+    RoamPath,
+    RoamPathException,
+    RoamTrace,
+)
+
+
+# Upper limits for the cost of `import roam` measured with `python -X importtime`,
+# with the time relative to the interpreter's own `site` startup in the same run
+# so the budget holds on slow and fast machines alike. Modules are fully used by
+# `roam` itself, `itertools`, and the failed probe for `_roam_speedups`
+IMPORT_TIME_BUDGET_SITE_RATIO = 0.5
+IMPORT_MODULES_BUDGET = 3
+
+
+def import_times(statement):
+    """ Return `{module: cumulative_us}` reported by `-X importtime` for a statement """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+# Run all tests against the pure-Python lookup core, and the accelerated core too
+# if the optional `_roam_speedups` extension module is installed, which it must
+# be when `ROAM_REQUIRE_SPEEDUPS` is set
+if os.environ.get("ROAM_REQUIRE_SPEEDUPS") and roam._roam_speedups is None:
+    raise RuntimeError("The _roam_speedups accelerator is required but not built")
+LOOKUP_CORES = {"python": (roam._py_lookup_attr, roam._py_lookup_item)}
+if roam._roam_speedups is not None:
+    LOOKUP_CORES["accelerated"] = (
+        roam._roam_speedups.lookup_attr,
+        roam._roam_speedups.lookup_item,
+    )
+
+
+@pytest.fixture(autouse=True, params=sorted(LOOKUP_CORES))
+def lookup_core(request, monkeypatch):
+    lookup_attr, lookup_item = LOOKUP_CORES[request.param]
+    monkeypatch.setattr(roam, "_lookup_attr", lookup_attr)
+    monkeypatch.setattr(roam, "_lookup_item", lookup_item)
+    return request.param
 
 
 class DataTester:
@@ -115,6 +193,13 @@ python_filmography = [
 ]
 
 
+def copy_of_filmography():
+    return [
+        DataTester(**{k: copy.deepcopy(v) for k, v in film.as_dict.items()})
+        for film in python_filmography
+    ]
+
+
 class TestRoamer:
     def test_missing_has_rich_falsey_behaviour(self):
         assert not MISSING
@@ -232,6 +317,9 @@ class TestRoamer:
 
         assert r(github_data)[2:4] == github_data[2:4]
 
+        assert r(github_data0)[:] == MISSING
+        assert r(github_data0)[::2] == MISSING
+
     def test_call_returns_item(self):
         assert r(github_data0).license.name() is github_data0["license"]["name"]
 
@@ -318,6 +406,46 @@ class TestRoamer:
         assert isinstance(r(github_data0).owner(_invoke=len, _roam=True), Roamer)
         assert r(github_data0).owner(_invoke=len, _roam=True) == 4
 
+    def test_call_with_invoke_each_option(self):
+        assert r(github_data)[:].name(_invoke_each=len) == (15, 5)
+        assert r(github_data)[:].name("-", _invoke_each=str.split) == (
+            ["java", "xmlbuilder"],
+            ["xml4h"],
+        )
+        assert r(github_data)[:].owner.fn(_invoke_each=True, message="Hi") == ("Hi",)
+        assert r(github_data)[:].license(
+            _invoke_each=lambda i: i["key"] if "mit" in i["key"] else MISSING
+        ) == ("mit",)
+        assert r(github_data)[:].x(_invoke_each=len) == ()
+        assert r(github_data0)[:](_invoke_each=len) is MISSING
+
+        # Single items are treated as the only one of many
+        assert r(github_data0).name(_invoke_each=len) == 15
+        assert r(github_data0).owner.fn(_invoke_each=True, message="Hi") == "Hi"
+
+        roamer = r(github_data)[:].name(_invoke_each=len, _roam=True)
+        assert isinstance(roamer, Roamer)
+        assert roamer[0] == 15
+
+    def test_call_with_invoke_each_and_executor_options(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            assert r(list(range(100)))[:](
+                _invoke_each=lambda i: i * 2, _executor=executor
+            ) == tuple(range(0, 200, 2))
+            result = r(github_data)[:].name(_invoke_each=len, _executor=executor)
+            assert result == (15, 5)
+
+        class RecordingExecutor:
+            def map(self, func, items, chunksize):
+                self.chunksize = chunksize
+                return map(func, items)
+
+        executor = RecordingExecutor()
+        assert r(github_data)[:].name(
+            _invoke_each=len, _executor=executor, _chunksize=10
+        ) == (15, 5)
+        assert executor.chunksize == 10
+
     def test_iterator_traversal(self):
         for i, item_roamer in enumerate(r(github_data)):
             assert isinstance(item_roamer, Roamer)
@@ -344,6 +472,81 @@ class TestRoamer:
         for _ in r(github_data0).fork:
             pytest.fail("Shouldn't be able to iterate over bool")
 
+    def test_iterator_element_paths(self):
+        writers = r(python_filmography)[:].writers
+        assert [str(writer.name) for writer in writers][1:3] == [
+            "<Roamer: <list>[:].writers[1].name => 'Neil Innes'>",
+            "<Roamer: <list>[:].writers[2].name => 'Douglas Adams'>",
+        ]
+        assert [writer for writer in writers][3] == writers[3]
+
+        # Raise option is kept by element shims, with the full path in errors
+        for i, film in enumerate(r(python_filmography, _raise=True)):
+            with pytest.raises(RoamPathException) as ex:
+                film.years["until"]
+            assert str(ex.value) == (
+                f"<RoamPathException: missing step 3 ['until'] for path"
+                f" <list>[{i}].years['until'] at <DataTester> with attrs [to]>"
+            )
+
+        # Shims can be iterated over in nested loops
+        roamer = r([1, 2])
+        assert [(a(), b()) for a in roamer for b in roamer] == [
+            (1, 1),
+            (1, 2),
+            (2, 1),
+            (2, 2),
+        ]
+
+        # Elements of non-sequence data get their own paths, as before
+        assert [str(key) for key in r({"a": 1})] == ["<Roamer: <str> => 'a'>"]
+
+    def test_iterator_is_allocation_light(self):
+        items = [{"a": i} for i in range(1000)]
+        roamer = r(items)
+
+        def blocks_held(make_shims):
+            tracemalloc.start()
+            try:
+                before = tracemalloc.take_snapshot()
+                shims = make_shims()
+                after = tracemalloc.take_snapshot()
+            finally:
+                tracemalloc.stop()
+            del shims
+            return sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+        # Iterated element shims need fewer allocations than full shims for the
+        # same items, which hold a path object each. Paths are built when needed
+        element_blocks = blocks_held(lambda: list(roamer))
+        full_blocks = blocks_held(lambda: [Roamer(item) for item in items])
+        assert element_blocks < full_blocks * 0.6, (element_blocks, full_blocks)
+        assert "_r_path_" not in vars(next(iter(roamer)))
+        element = list(roamer)[5]
+        assert element.a == 5
+        assert str(element) == "<Roamer: <list>[5] => {'a': 5}>"
+
+    def test_iter_paths(self):
+        name_path = path_of(r(None).license.name)
+        assert list(iter_paths(r(github_data), name_path)) == [
+            "Apache License 2.0",
+            "MIT License",
+        ]
+        assert list(iter_paths(r(github_data)[:].owner, path_of(r(None).fn))) == [
+            github_data0["owner"]["fn"],
+            MISSING,
+        ]
+        assert list(iter_paths(r(github_data0).size, name_path)) == []
+
+        with pytest.raises(RoamPathException) as ex:
+            list(iter_paths(r(github_data)[:].owner, path_of(r(None).fn), _raise=True))
+        assert str(ex.value) == (
+            "<RoamPathException: missing step 4 .fn for path <list>[:].owner[1].fn"
+            " at <dict> with keys ['login', 'url', 'type']>"
+        )
+        with pytest.raises(RoamPathException):
+            list(iter_paths(r_strict(github_data)[:].owner, path_of(r(None).fn)))
+
     def test_iterator_traversal_missing(self):
         for _ in r(github_data0).x:
             pytest.fail("Shouldn't be able to iterate over MISSING")
@@ -422,6 +625,65 @@ class TestRoamer:
     def test_roamer_equality(self):
         assert r(python_filmography)[:].writers == r(python_filmography)[:].writers
 
+        assert r(github_data).x == r(github_data).x
+        assert r(github_data)[0] != r(github_data)[1]
+        assert r(github_data)[0].name != r(github_data)[0]["name"]
+        assert r(github_data)[0] != r(github_data, _raise=True)[0]
+        # Paths over equal but distinct data are not equal
+        assert r(github_data)[0] != r(list(github_data))[0]
+
+    def test_roamer_equality_does_not_compare_data(self):
+        class UncomparableDict(dict):
+            eq_calls = 0
+
+            def __eq__(self, other):
+                UncomparableDict.eq_calls += 1
+                return super().__eq__(other)
+
+            __hash__ = None
+
+        items = [UncomparableDict(c=i) for i in range(10000)]
+        big_data = UncomparableDict(a=UncomparableDict(b=items))
+        roamer = r(big_data)
+
+        assert roamer.a.b[:].c == roamer.a.b[:].c
+        assert roamer.a["b"][5] == roamer.a["b"][5]
+        assert roamer.a.b[5] != roamer.a.b[6]
+        assert roamer.a.x == roamer.a.x
+        assert UncomparableDict.eq_calls == 0
+
+    def test_roamer_hashing(self):
+        roamer = r(github_data)
+        cache = {
+            roamer[0].name: "first",
+            roamer[1].name: "second",
+            roamer[:].name: "all",
+            roamer.x: "missing",
+        }
+        assert cache[roamer[0].name] == "first"
+        assert cache[roamer[1].name] == "second"
+        assert cache[roamer[:].name] == "all"
+        assert cache[roamer.x] == "missing"
+        assert len({roamer[0].name, roamer[0].name, roamer[0]["name"]}) == 2
+        assert hash(r(github_data)[0]) != hash(r(list(github_data))[0])
+
+        # Shims and paths with unhashable keys can still be hashed
+        empty = {}
+        assert hash(r(empty)[[1]]) == hash(r(empty)[[1]])
+        assert r(empty)[[1]] == r(empty)[[1]] and r(empty)[[1]] != r(empty)[[2]]
+        assert hash(path_of(r(empty)[{"a": 1}])) == hash(path_of(r(empty)[{"a": 1}]))
+
+        # Traversing further from a missing shim does not change its hash
+        missing = roamer.x
+        missing_hash = hash(missing)
+        assert str(missing.y.z) == (
+            "<Roamer: missing step 1 .x for path <list>.x.y.z at <list> => <MISSING>>"
+        )
+        assert hash(missing) == missing_hash
+        assert str(missing) == (
+            "<Roamer: missing step 1 .x for path <list>.x at <list> => <MISSING>>"
+        )
+
     def test_roamer_len(self):
         # Standard length lookup of list
         assert len(r(python_filmography)) == 2
@@ -537,3 +799,849 @@ class TestRoamer:
             == "<RoamPathException: missing step 3 .wrong for path <list>[0].license.wrong"
             " at <dict> with keys ['key', 'name', 'spdx_id', 'url']>"
         )
+
+    def test_path_of_rebinds_to_other_data(self):
+        path = path_of(r(github_data)[:].license["name"])
+
+        assert isinstance(path, RoamPath)
+        assert repr(path) == "<RoamPath: [:].license['name']>"
+        assert len(path) == 3
+
+        assert path(github_data) == ("Apache License 2.0", "MIT License")
+        assert path(github_data[1:]) == ("MIT License",)
+        assert path.roam(github_data) == r(github_data)[:].license["name"]
+        assert (
+            str(path.roam(github_data))
+            == "<Roamer: <list>[:].license['name'] => ('Apache License 2.0', 'MIT License')>"
+        )
+
+        path = path_of(r(python_filmography)[0].writers[1].name)
+        assert path(python_filmography) == "Neil Innes"
+        assert path([]) is MISSING
+        with pytest.raises(RoamPathException) as ex:
+            path([], _raise=True)
+        assert (
+            str(ex.value)
+            == "<RoamPathException: missing step 1 [0] for path <list>[0].writers[1].name at <list>"
+            " with length 0>"
+        )
+        with pytest.raises(RoamPathException):
+            path.roam([], _raise=True)
+
+        # Paths through the results of calls cannot be replayed
+        class A:
+            b = 0
+
+            def get(self):
+                return {"b": 1}
+
+        roamer = r(A()).get(_roam=True).b
+        assert roamer == 1
+        with pytest.raises(ValueError):
+            path_of(roamer)
+        with pytest.raises(ValueError):
+            path_of(r({"a": [1, 2]}).a(_invoke=len, _roam=True))
+        with pytest.raises(ValueError):
+            path_of(list(r({"a": [[1]]}).a(_roam=True))[0][0])
+        assert path_of(r(A()).get.b)(A()) is MISSING
+
+    def test_path_of_pickles_without_data(self):
+        roamer = r({"big": list(range(100000)), "a": {"b": [1, 2, 3]}}).a.b[1:]
+        path = path_of(roamer)
+
+        pickled = pickle.dumps(path)
+        assert len(pickled) < len(pickle.dumps(roamer._r_path_._r_root_item_)) / 100
+
+        unpickled = pickle.loads(pickled)
+        assert unpickled == path
+        assert hash(unpickled) == hash(path)
+        assert unpickled({"a": {"b": [4, 5, 6]}}) == [5, 6]
+
+        assert path != path_of(r({}).a.b[2:])
+        assert path_of(r({}).a) != path_of(r({})["a"])
+
+    def test_import_cost_within_budget(self):
+        # Compile bytecode up front so it is not counted, even when Python is
+        # told not to write bytecode on import
+        py_compile.compile(roam.__file__)
+        baseline = import_times("pass")
+        # Take the best of a few runs to smooth over noise
+        runs = [import_times("import roam") for _ in range(3)]
+
+        ratio = min(run["roam"] / run["site"] for run in runs)
+        assert ratio < IMPORT_TIME_BUDGET_SITE_RATIO
+
+        extra_modules = set(runs[-1]) - set(baseline)
+        assert "roam" in extra_modules
+        assert len(extra_modules) <= IMPORT_MODULES_BUDGET, sorted(extra_modules)
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 7), reason="Module __getattr__ requires Python 3.7+"
+    )
+    def test_lazy_module_attributes(self, monkeypatch):
+        monkeypatch.setitem(roam._LAZY_MODULES, "lazy_json", "json")
+        assert "lazy_json" in dir(roam)
+        assert "lazy_json" not in vars(roam)
+
+        import json
+
+        assert roam.lazy_json is json
+        assert vars(roam)["lazy_json"] is json
+        del vars(roam)["lazy_json"]
+
+        with pytest.raises(AttributeError):
+            roam.not_a_lazy_module
+
+    def test_path_hints_are_bounded(self, monkeypatch):
+        big_dict = {f"key{i}": i for i in range(100000)}
+
+        assert (
+            str(r(big_dict, _hint_limit=3).kye5)
+            == "<Roamer: missing step 1 .kye5 for path <dict>.kye5 at <dict> with keys"
+            " ['key0', 'key1', 'key2', ...and 99997 more] closest matches ['key5', 'key95', 'key85']"
+            " => <MISSING>>"
+        )
+        # Option survives traversal and cloning
+        assert (
+            str(r(r({"a": big_dict}, _hint_limit=2).a).x)
+            == "<Roamer: missing step 2 .x for path <dict>.a.x at <dict> with keys"
+            " ['key0', 'key1', ...and 99998 more] => <MISSING>>"
+        )
+
+        # Global default limit
+        monkeypatch.setattr(roam, "HINT_LIMIT", 1)
+        with pytest.raises(RoamPathException) as ex:
+            r_strict(github_data0).license.nmae
+        assert (
+            str(ex.value)
+            == "<RoamPathException: missing step 2 .nmae for path <dict>.license.nmae"
+            " at <dict> with keys ['key', ...and 3 more] closest matches ['name']>"
+        )
+        assert (
+            str(r(python_filmography)[0].titel)
+            == "<Roamer: missing step 2 .titel for path <list>[0].titel at <DataTester>"
+            " with attrs [title, ...and 3 more] closest matches [title] => <MISSING>>"
+        )
+
+        # Per-shim limit overrides global default
+        assert (
+            str(r(github_data0, _hint_limit=50).license.x)
+            == "<Roamer: missing step 2 .x for path <dict>.license.x at <dict>"
+            " with keys ['key', 'name', 'spdx_id', 'url'] => <MISSING>>"
+        )
+
+    def test_path_hints_do_not_consume_all_keys(self):
+        class LazyKeys(dict):
+            consumed = 0
+
+            def keys(self):
+                for k in super().keys():
+                    LazyKeys.consumed += 1
+                    yield k
+
+        data = LazyKeys((i, i) for i in range(10000))
+        assert (
+            r(data, _hint_limit=2)[-1]._r_path_.description()
+            == "missing step 1 [-1] for path <LazyKeys>[-1] at <LazyKeys> with keys [0, 1, ...]"
+        )
+        assert LazyKeys.consumed == 3
+
+    def test_assign_and_update_in_place(self):
+        data = {
+            "items": [
+                {"price": {"amount": 1, "currency": "AUD"}},
+                {"price": {"amount": 2}},
+                {"name": "no price"},
+            ],
+            "owner": DataTester(name="Alice"),
+        }
+
+        assert assign(r(data)["items"][:].price.currency, "USD") is data
+        assert [i.get("price", {}).get("currency") for i in data["items"]] == [
+            "USD",
+            "USD",
+            None,
+        ]
+
+        update(r(data)["items"][:].price.amount, lambda amount: amount * 10)
+        assert r(data)["items"][:].price.amount == (10, 20)
+
+        # Missing final step is created, with MISSING passed to an update
+        update(r(data).owner.age, lambda age: [age])
+        assert data["owner"].age == [MISSING]
+        assign(r(data)["items"][-1].name, "renamed")
+        assert data["items"][-1] == {"name": "renamed"}
+
+        # Integer lookups and slices apply to flattened results, like traversal
+        data = copy_of_filmography()
+        assign(r(data)[:].writers[1].name, "Changed")
+        assert r(data)[:].writers.name == (
+            "Monty Python",
+            "Changed",
+            "Douglas Adams",
+            "Monty Python",
+        )
+        assign(r(data)[:].writers[1:3].group, False)
+        assert r(data)[:].writers.group == (True, False, False, True)
+
+        # Invalid path steps raise except within collections
+        with pytest.raises(RoamPathException) as ex:
+            assign(r(data)[0].nope.name, "x")
+        assert str(ex.value).startswith(
+            "<RoamPathException: missing step 2 .nope for path <list>[0].nope.name"
+        )
+        with pytest.raises(RoamPathException):
+            assign(r({"a": 1})[:].b, "x")
+        assign(r(data)[:].nope.name, "x")
+
+        # Locations that cannot store a value are skipped within collections,
+        # and raise for single paths, before any data is changed
+        data = [{"x": 0}, 1, None, (2,), DataTester(x=3)]
+        assert assign(r(data)[:].x, 5) is data
+        assert data == [{"x": 5}, 1, None, (2,), data[-1]]
+        assert data[-1].x == 5
+        data = {"a": None, "t": (1, 2), "p": collections.namedtuple("P", "x")(1)}
+        for roamer in (r(data).a.b, r(data).t[0], r(data).p.x, r(data).p.y):
+            with pytest.raises(RoamPathException):
+                assign(roamer, "x")
+        assert data["a"] is None and data["t"] == (1, 2) and data["p"].x == 1
+
+        # Including final slice and index steps within collections, and
+        # read-only properties and frozen classes
+        class ReadOnly:
+            x = property(lambda self: 1)
+
+        data = [{"t": [1, 2]}, {"t": (3, 4)}]
+        assign(r(data)[:].t[:], 0)
+        assert data == [{"t": [0, 0]}, {"t": (3, 4)}]
+        assign(r(data)[:].t[-1], 9)
+        assert data == [{"t": [0, 0]}, {"t": (3, 4)}]
+        data = [{"x": 0}, ReadOnly()]
+        assign(r(data)[:].x, 5)
+        assert data[0] == {"x": 5} and data[1].x == 1
+        with pytest.raises(RoamPathException):
+            assign(r(data)[1].x, 5)
+        with pytest.raises(RoamPathException):
+            assign(r((1, 2))[:], 0)
+        dataclasses = pytest.importorskip("dataclasses")
+        Frozen = dataclasses.make_dataclass("Frozen", ["x"], frozen=True)
+        data = [{"x": 0}, Frozen(1)]
+        assign(r(data)[:].x, 5)
+        assert data == [{"x": 5}, Frozen(1)]
+
+    def test_assign_and_update_copy_on_write(self):
+        Point = collections.namedtuple("Point", ["x", "y"])
+        data = {
+            "untouched": {"big": list(range(1000))},
+            "points": [Point(1, 2), Point(3, 4)],
+            "nested": ({"a": 1}, {"a": 2}),
+            "owner": DataTester(name="Alice"),
+        }
+        original = {
+            "untouched": data["untouched"],
+            "points": list(data["points"]),
+            "nested": data["nested"],
+            "owner": data["owner"],
+        }
+
+        new_data = update(r(data).points[:].x, lambda x: x * 100, _copy=True)
+        assert new_data is not data
+        assert new_data["points"] == [Point(100, 2), Point(300, 4)]
+        assert isinstance(new_data["points"][0], Point)
+        assert new_data["untouched"] is data["untouched"]
+        assert new_data["owner"] is data["owner"]
+        assert data == original
+
+        new_data = assign(r(data).nested[1].a, 20, _copy=True)
+        assert new_data["nested"] == ({"a": 1}, {"a": 20})
+        assert new_data["nested"][0] is data["nested"][0]
+        assert data == original
+
+        new_data = assign(r(data).owner.name, "Bob", _copy=True)
+        assert new_data["owner"].name == "Bob"
+        assert data["owner"].name == "Alice"
+
+        # Same for data-free paths
+        path = path_of(r(data).nested[:].a)
+        assert path.assign(data, 0, _copy=True)["nested"] == ({"a": 0}, {"a": 0})
+        assert path.update({"nested": [{"a": 1}]}, str) == {"nested": [{"a": "1"}]}
+        assert data == original
+
+        # Copies can replace existing tuple items and namedtuple fields only
+        assert assign(r(data).points[:].z, 0, _copy=True)["points"] == data["points"]
+        with pytest.raises(RoamPathException):
+            assign(r(data).nested[2], {}, _copy=True)
+        assert data == original
+
+    def test_lookups_use_swappable_core(self, monkeypatch):
+        calls = []
+
+        def lookup_attr(*args):
+            calls.append(("attr",) + args)
+            return roam._py_lookup_attr(*args)
+
+        def lookup_item(*args):
+            calls.append(("item",) + args)
+            return roam._py_lookup_item(*args)
+
+        monkeypatch.setattr(roam, "_lookup_attr", lookup_attr)
+        monkeypatch.setattr(roam, "_lookup_item", lookup_item)
+
+        assert r(github_data)[:].license["key"]() == ("apache-2.0", "mit")
+        assert [call[0] for call in calls] == ["item", "attr", "item"]
+        assert calls[1][2] is True  # Multi-item flag passed through
+
+        # No lookups are done once the path is MISSING
+        calls.clear()
+        assert r(github_data0).x.y["z"]() is MISSING
+        assert len(calls) == 1
+
+    @pytest.mark.skipif(roam._roam_speedups is None, reason="Accelerator not built")
+    def test_speedups_match_python_lookups(self):
+        Point = collections.namedtuple("Point", "x y")
+
+        class Slotted:
+            __slots__ = ("a", "b")
+
+            def __init__(self):
+                self.a = 1
+
+        items = [
+            {"a": 1, "x": None},
+            [{"a": [1, 2]}, {"a": (3,)}, {"a": range(2)}, {}, None, 5],
+            (Point(1, 2), Point(None, 3), DataTester(x=4), Slotted()),
+            Point(1, 2),
+            Slotted(),
+            DataTester(a=1, items="attr"),
+            "text",
+            5,
+            None,
+            MISSING,
+        ]
+        keys = ["a", "b", "x", "y", "items", "keys", 0, -1, 5, slice(1, None), True]
+        for item in items:
+            for is_multi in (False, True):
+                for key in keys:
+                    args = (item, is_multi, key)
+                    for lookups in (
+                        (roam._py_lookup_item, roam._roam_speedups.lookup_item),
+                        (roam._py_lookup_attr, roam._roam_speedups.lookup_attr),
+                    ):
+                        if lookups[0] is roam._py_lookup_attr and not isinstance(
+                            key, str
+                        ):
+                            continue
+                        results = []
+                        for lookup in lookups:
+                            try:
+                                results.append(lookup(*args))
+                            except Exception as ex:
+                                results.append(type(ex))
+                        assert results[0] == results[1], args
+
+    def test_speedups_module_is_used_if_installed(self, monkeypatch):
+        calls = []
+        speedups = types.ModuleType("_roam_speedups")
+
+        def init(missing, field_map):
+            speedups.missing = missing
+            speedups.field_map = field_map
+
+        def lookup_attr(*args):
+            calls.append("attr")
+            return module._py_lookup_attr(*args)
+
+        def lookup_item(*args):
+            calls.append("item")
+            return module._py_lookup_item(*args)
+
+        speedups.init = init
+        speedups.lookup_attr = lookup_attr
+        speedups.lookup_item = lookup_item
+        monkeypatch.setitem(sys.modules, "_roam_speedups", speedups)
+
+        # Load a separate copy of the module, to leave `roam` itself untouched
+        spec = importlib.util.spec_from_file_location("roam_speedups", roam.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        assert module._roam_speedups is speedups
+        assert speedups.missing is module.MISSING
+        assert speedups.field_map is module._field_map
+        assert module.r({"a": [{"b": 1}, {}]}).a[:].b == (1,)
+        assert calls == ["attr", "item", "attr"]
+        assert module.r({}).x() is module.MISSING
+        assert calls[-1] == "attr"
+
+        # Shims with memo or trace options use the pure-Python lookups
+        calls.clear()
+        assert module.r({"a": 1}, _memo=True, _trace=True).a == 1
+        assert calls == []
+
+    def test_memoize_attrs_and_calls(self):
+        class Expensive:
+            computed = 0
+
+            def __init__(self, value):
+                self.value = value
+
+            @property
+            def prop(self):
+                Expensive.computed += 1
+                return {"nested": self.value}
+
+            def method(self, factor=1):
+                Expensive.computed += 1
+                return self.value * factor
+
+        data = {"items": [Expensive(1), Expensive(2)]}
+        memo = RoamMemo()
+        roamer = r(data, _memo=memo)
+
+        assert roamer["items"][0].prop.nested == 1
+        assert roamer["items"][0]["prop"]["nested"] == 1
+        assert Expensive.computed == 1
+        assert roamer["items"][:].prop.nested == (1, 2)
+        assert Expensive.computed == 2
+        assert (memo.hits, memo.misses) == (2, 2)
+
+        assert roamer["items"][1].method() == 2
+        assert roamer["items"][1].method() == 2
+        assert roamer["items"][1].method(factor=10) == 20
+        assert roamer["items"][1].method(10) == 20
+        assert Expensive.computed == 5
+        assert repr(memo) == "<RoamMemo: hits=3 misses=5 size=5 maxsize=1024>"
+
+        # Memo is shared by shims derived from the root shim
+        assert [item.prop.nested() for item in roamer["items"]] == [1, 2]
+        assert r(roamer)["items"][1].method() == 2
+        assert Expensive.computed == 5
+
+        # Shims without memo option are unaffected
+        assert r(data)["items"][0].prop.nested == 1
+        assert Expensive.computed == 6
+
+        memo.clear()
+        assert (len(memo), memo.hits, memo.misses) == (0, 0, 0)
+        assert r(data, _memo=True)["items"][0].prop.nested == 1
+        assert Expensive.computed == 7
+
+    def test_memo_eviction_and_weak_references(self):
+        class Item:
+            def __init__(self, value):
+                self.value = value
+
+        memo = RoamMemo(maxsize=2)
+        items = [Item(i) for i in range(3)]
+        roamer = r(items, _memo=memo)
+
+        assert roamer[:].value == (0, 1, 2)
+        assert len(memo) == 2
+        assert roamer[1].value == 1
+        assert roamer[2].value == 2
+        assert roamer[0].value == 0
+        assert (memo.hits, memo.misses) == (2, 4)
+
+        # Data is not kept alive by the memo
+        del roamer
+        items.pop(0)
+        assert len(memo) == 1
+        items.clear()
+        assert len(memo) == 0
+
+        # Objects without weak reference support and unhashable arguments are
+        # not cached
+        memo = RoamMemo()
+        assert r({"a": {"b": 1}}, _memo=memo).a.b == 1
+        item = Item(lambda x: x)
+        assert r(item, _memo=memo).value([1]) == [1]
+        assert r(item, _memo=memo).value([1]) == [1]
+        assert (len(memo), memo.hits, memo.misses) == (1, 1, 1)
+
+        # Bound methods and other results referring to their object are not
+        # cached, so the object is not kept alive
+        class Rel:
+            def __init__(self, owner):
+                self.owner = owner
+
+        class Parent:
+            def method(self):
+                return 1
+
+            @property
+            def child(self):
+                return {"parent": self}
+
+            @property
+            def rel(self):
+                return Rel(self)
+
+            @property
+            def related(self):
+                return [Rel(self)]
+
+        memo = RoamMemo()
+        item = Parent()
+        item_ref = weakref.ref(item)
+        assert r(item, _memo=memo).method() == 1
+        assert r(item, _memo=memo).child.parent() is item
+        assert r(item, _memo=memo).rel.owner() is item
+        assert r(item, _memo=memo).related[0].owner() is item
+        assert r(item, _memo=memo).method() == 1
+        # Only the result of calling `.method` stays cached. Lookups of `.owner`
+        # were cached for the short-lived `Rel` objects until they went away
+        assert (len(memo), memo.hits, memo.misses) == (1, 1, 3)
+        del item
+        gc.collect()
+        assert item_ref() is None
+        assert len(memo) == 0
+
+        # Results referring to their object beyond the searched depth are
+        # cached, and keep it alive until cleared
+        class Deep:
+            @property
+            def nested(self):
+                return [[[[self]]]]
+
+        item = Deep()
+        item_ref = weakref.ref(item)
+        assert r(item, _memo=memo).nested[0][0][0][0]() is item
+        assert len(memo) == 1
+        del item
+        gc.collect()
+        assert item_ref() is not None
+        memo.clear()
+        gc.collect()
+        assert item_ref() is None
+
+    def test_trace_records_lookup_strategies(self):
+        class Item:
+            def __init__(self, value):
+                self.value = value
+
+        Point = collections.namedtuple("Point", "x y")
+        data = {"entries": [Item(1), {"value": 2}, Item(None)], "point": Point(3, 4)}
+        trace = RoamTrace()
+        roamer = r(data, _trace=trace)
+
+        assert roamer.entries[:].value == (1, 2)
+        assert roamer["point"]["x"] == 3
+        assert roamer["point"].z() is MISSING
+        assert repr(trace) == "<RoamTrace: records=7>"
+
+        records = trace.as_dicts()
+        assert [
+            (r["index"], r["step"], r["strategies"], r["items_in"], r["items_out"])
+            for r in records
+        ] == [
+            (0, ".entries", {"item_fallback": 1}, 1, 1),
+            (1, "[:]", {"slice": 1}, 1, 3),
+            (2, ".value", {"attr": 2, "item_fallback": 1}, 3, 2),
+            (0, "['point']", {"item": 1}, 1, 1),
+            (1, "['x']", {"field": 1}, 1, 1),
+            (0, "['point']", {"item": 1}, 1, 1),
+            (1, ".z", {"missing": 1}, 1, 0),
+        ]
+        assert all(r["seconds"] >= 0 for r in records)
+        assert records[1]["op"] == "getitem" and records[1]["key"] == [None, None, None]
+        assert records[2]["ops"] == [
+            ["getattr", "entries"],
+            ["getitem", [None, None, None]],
+            ["getattr", "value"],
+        ]
+
+        # Exported records can be serialised as JSON, whatever the keys
+        other_trace = RoamTrace()
+        other = r({("a", 1): [{}, {}, {}]}, _trace=other_trace)
+        assert other[("a", 1)][2:0:-1][Item(0)]() == ()
+        exported = other_trace.as_dicts()
+        assert json.loads(json.dumps(exported)) == exported
+        assert exported[-1]["ops"][:2] == [
+            ["getitem", ["a", 1]],
+            ["getitem", [2, 0, -1]],
+        ]
+        assert exported[-1]["key"].startswith("<test_roam.")
+
+        # Exported records are copies
+        records[0]["strategies"].clear()
+        assert trace.records[0]["strategies"] == {"item_fallback": 1}
+
+        # Summary combines lookups along the same path to a step only
+        assert roamer.entries[:].value == (1, 2)
+        assert [item.value() for item in roamer["entries"]] == [1, 2, None]
+        summary = {s["path"]: s for s in trace.summary()}
+        value_step = summary[".entries[:].value"]
+        assert value_step["ops"] == (
+            ("getattr", "entries"),
+            ("getitem", slice(None)),
+            ("getattr", "value"),
+        )
+        assert value_step["lookups"] == 2
+        assert value_step["strategies"] == {"attr": 4, "item_fallback": 2}
+        assert (value_step["items_in"], value_step["items_out"]) == (6, 4)
+        assert summary["['entries'][1].value"]["strategies"] == {"item_fallback": 1}
+        assert summary["['entries'][1].value"]["index"] == 2
+        assert summary["['entries']"]["lookups"] == 1
+        assert [s["index"] for s in trace.summary()] == [0, 0, 0, 1, 1, 1, 2, 2, 2, 2]
+
+        # Trace is shared by derived and iterated shims, alongside a memo
+        trace.clear()
+        assert len(trace) == 0
+        roamer = r(data, _trace=True, _memo=True)
+        assert [item.value() for item in roamer["entries"]] == [1, 2, None]
+        assert len(roamer._r_trace_) == 4
+        assert r(data).entries._r_trace_ is None
+
+    def test_trace_specialized_path(self):
+        class Item:
+            def __init__(self, name):
+                self.name = name
+
+        data = {"groups": [{"entries": [Item("a"), Item("b")]}, {"entries": []}]}
+        path = path_of(r(data).groups[:].entries["name"])
+        trace = RoamTrace()
+        assert path.roam(data) == ("a", "b")
+        path.roam(r(data, _trace=trace))
+        specialized = path.specialize(trace)
+        assert specialized._r_hints_ == (True, False, True, True)
+        assert specialized == path and hash(specialized) == hash(path)
+
+        # Specialized path gives the same results for data of the same shape
+        other = {"groups": [{"entries": [Item("c")]}, {"entries": [Item("d"), 5]}]}
+        for item in (data, other, {"groups": []}, {}, None):
+            assert specialized(item) == path(item)
+            assert specialized.resolve(item) == path.resolve(item)
+            assert list(specialized.iter_results(item)) == list(path.iter_results(item))
+            assert specialized.count(item) == path.count(item)
+
+        # Hints are applied alike by `resolve()`, `iter_results()`, and the
+        # methods built on it, for data where both kinds of lookup work
+        class AttrDict(dict):
+            name = "attr"
+
+        names = path_of(r(None)[:].name)
+        trace = RoamTrace()
+        assert names.roam(r([{"name": "x"}], _trace=trace)) == ("x",)
+        specialized_names = names.specialize(trace)
+        both = [AttrDict(name="item")]
+        assert names.resolve(both) == ("attr",)
+        assert specialized_names.resolve(both) == ("item",)
+        assert list(specialized_names.iter_results(both)) == ["item"]
+        assert specialized_names.first(both) == "item"
+        name = path_of(r(None).name)
+        assert r({"name": "x"}, _trace=trace).name == "x"
+        assert list(name.specialize(trace).iter_results(both[0])) == ["item"]
+        assert list(name.iter_results(both[0])) == ["attr"]
+
+        # Hints survive pickling
+        assert pickle.loads(pickle.dumps(specialized))._r_hints_ == (
+            True,
+            False,
+            True,
+            True,
+        )
+
+        # No hints when the usual strategy worked, or for other paths' traces
+        assert path_of(r(data)["groups"]).specialize(trace)._r_hints_ is None
+        assert path_of(r(data).other).specialize(trace)._r_hints_ is None
+
+        # Lookups of the same step along another path are not used
+        trace = RoamTrace()
+        assert r({"a": {"name": "x"}}, _trace=trace).a.name == "x"
+        assert path_of(r(None).a.name).specialize(trace)._r_hints_ == (True, True)
+        assert path_of(r(None).b.name).specialize(trace)._r_hints_ is None
+
+    def test_iter_results_matches_traversal(self):
+        paths = [
+            r(python_filmography)[:].title,
+            r(python_filmography)[:].writers.name,
+            r(python_filmography)[:]["writers"]["name"][1:-1],
+            r(python_filmography)[:].writers[-1].name,
+            r(python_filmography)[:].writers[2:][0].name,
+            r(python_filmography)[:].writers.name[::-2],
+            r(python_filmography)[:].writers.group,
+            r(python_filmography)[-1:].years.to,
+            r(python_filmography)[:].writers[9],
+            r(github_data)[:].owner.fn,
+            r(github_data)[:].license["key"],
+            r(github_data)[0].license[:],
+            r(github_data)[0].license.name,
+            r(github_data)[:].x,
+            r(github_data).x[:].y,
+            r({"g": iter([1, 2, 3])}).g[:],
+            r({"g": (i for i in range(3))}).g[1:],
+        ]
+        for roamer in paths:
+            path = path_of(roamer)
+            results = tuple(path.iter_results(roamer._r_path_._r_root_item_))
+            if roamer._r_is_multi_item_:
+                assert results == tuple(roamer() or ()), path
+            else:
+                assert results == ((roamer(),) if roamer else ()), path
+
+        # Single iterators cannot be sliced, and are not consumed trying
+        data = {"g": iter([1, 2, 3])}
+        assert list(path_of(r(None).g[:]).iter_results(data)) == []
+        assert list(data["g"]) == [1, 2, 3]
+
+    def test_iter_results_terminals(self):
+        orders = {
+            "people": [
+                {"name": "Alice", "orders": [{"total": 3}, {"total": 4}]},
+                {"name": "Bob", "orders": [{"total": 5}]},
+                {"name": "Trudy"},
+            ]
+        }
+        totals = path_of(r(None).people[:].orders.total)
+
+        assert totals.count(orders) == 3
+        assert totals.sum(orders) == 12
+        assert totals.sum(orders, 0.5) == 12.5
+        assert totals.min(orders) == 3
+        assert totals.max(orders) == 5
+        assert totals.first(orders) == 3
+        assert totals.any(orders)
+        assert totals.any(orders, lambda total: total > 4)
+        assert not totals.any(orders, lambda total: total > 5)
+        repeated = {"people": [{"orders": [{"total": 1}] * 3}]}
+        assert list(totals.distinct(repeated)) == [1]
+        # Unhashable results are compared by equality
+        tags = path_of(r(None)[:].tags)
+        tagged = [{"tags": [["a"], {"b": 1}]}, {"tags": [["a"], 2, {"b": 1}, 2]}]
+        assert list(tags.distinct(tagged)) == [["a"], {"b": 1}, 2]
+
+        assert totals.count({}) == 0
+        assert totals.sum({}) == 0
+        assert totals.min({}) is MISSING
+        assert totals.max({}, default=None) is None
+        assert totals.first({}) is MISSING
+        assert not totals.any({})
+
+        people = path_of(r(None).people[:])
+        assert people.group_by(orders, path_of(r(None).orders[0].total)) == {
+            3: 1,
+            5: 1,
+            MISSING: 1,
+        }
+        names_by_initial = people.group_by(
+            orders,
+            path_of(r(None).name[0]),
+            func=lambda names, person: names + (person["name"],),
+            initial=(),
+        )
+        assert names_by_initial == {"A": ("Alice",), "B": ("Bob",), "T": ("Trudy",)}
+
+    def test_iter_results_stops_early(self):
+        class Counted:
+            looked_up = 0
+
+            def __init__(self, value):
+                self._value = value
+
+            @property
+            def value(self):
+                Counted.looked_up += 1
+                return self._value
+
+        data = [Counted(i) for i in range(1000)]
+        values = path_of(r(None)[:].value)
+
+        assert values.first(data) == 0
+        assert values.any(data, lambda value: value == 9)
+        assert path_of(r(None)[:].value[5]).first(data) == 5
+        assert Counted.looked_up == 1 + 10 + 6
+
+        assert values.count(data) == 1000
+        assert values.max(data) == 999
+
+    def test_field_lookups(self):
+        dataclasses = pytest.importorskip("dataclasses")
+        Point = collections.namedtuple("Point", ["x", "y"])
+
+        @dataclasses.dataclass
+        class Line:
+            start: Point
+            end: Point = None
+            label: dataclasses.InitVar[str] = None
+            count: typing.ClassVar[int] = 0
+
+        class Slotted:
+            __slots__ = ("line", "_hidden")
+
+            def __init__(self, line):
+                self.line = line
+
+        class SlottedWithItems(Slotted):
+            __slots__ = ()
+
+            def __getitem__(self, key):
+                return f"item {key}"
+
+        line = Line(Point(1, 2), Point(3, 4))
+        data = [Slotted(line), Slotted(Line(Point(5, 6)))]
+
+        assert roam._field_map(Point) == {"x": 0, "y": 1}
+        assert roam._field_map(Line) == {"start": None, "end": None}
+        assert roam._field_map(Slotted) == {"line": None, "_hidden": None}
+        assert roam._field_map(SlottedWithItems) is None
+        assert roam._field_map(dict) is None
+        assert roam._field_map(DataTester) is None
+
+        assert r(data)[0]["line"]["start"]["y"] == 2
+        assert r(data)[0].line.end.x == 3
+        assert r(data)[:]["line"] == (line, data[1].line)
+        # Namedtuples are flattened like other tuples within collections
+        assert r(data)[:]["line"]["end"] == (3, 4)
+        assert r(data)[:]["_hidden"] == ()
+        assert r(data)[0]["_hidden"]() is MISSING
+        assert r(line)["label"]() is None  # InitVar default is a class attr
+        assert r(line)["count"]() == 0
+        assert r(SlottedWithItems(line))["line"] == "item line"
+        assert r(Point(1, 2))[1] == 2
+
+        # Fields are listed in hints without needing `dir()`
+        assert str(r(data)[0].line.start.z) == (
+            "<Roamer: missing step 4 .z for path <list>[0].line.start.z"
+            " at <Point> with attrs [x, y] => <MISSING>>"
+        )
+        assert str(r(data)[0].line["middle"]) == (
+            "<Roamer: missing step 3 ['middle'] for path <list>[0].line['middle']"
+            " at <Line> with attrs [start, end] => <MISSING>>"
+        )
+        assert str(r(data)[0].line.start[2]) == (
+            "<Roamer: missing step 4 [2] for path <list>[0].line.start[2]"
+            " at <Point> with length 2 => <MISSING>>"
+        )
+
+    def test_field_maps_do_not_keep_classes_alive(self):
+        Point = collections.namedtuple("Point", ["x", "y"])
+        point_id = id(Point)
+        point_ref = weakref.ref(Point)
+        assert r(Point(1, 2))["y"] == 2
+        assert point_id in roam._FIELD_MAPS
+
+        # Field maps of other classes are kept as classes come and go
+        for i in range(2000):
+            cls = collections.namedtuple(f"Point{i}", ["x", "y"])
+            assert r(cls(1, 2))["x"] == 1
+        del cls
+        gc.collect()
+        assert point_id in roam._FIELD_MAPS
+
+        del Point
+        gc.collect()
+        assert point_ref() is None
+        assert point_id not in roam._FIELD_MAPS
+        assert len(roam._FIELD_MAPS) == len(roam._FIELD_MAP_REFS) < 100
+
+    def test_field_lookups_for_attrs_classes(self):
+        attr = pytest.importorskip("attr")
+
+        @attr.s(slots=True)
+        class Point:
+            x = attr.ib()
+            y = attr.ib(default=None)
+
+        assert roam._field_map(Point) == {"x": None, "y": None}
+        assert r([Point(1, 2), Point(3)])[:]["y"] == (2,)
+        assert r(Point(1))["x"] == 1